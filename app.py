@@ -1,13 +1,26 @@
 #!/usr/bin/env python3
 """
-Flask API for RevampSite
+Quart API for RevampSite
 Main application server handling requirements collection
+
+Async (ASGI) so slow I/O-bound endpoints (Instagram scraping, Lovable
+automation) don't block the whole worker while they wait.
 """
 
-from flask import Flask, request, jsonify, render_template
-from flask_cors import CORS
+from quart import Quart, request, jsonify, Response
+from quart.json.provider import JSONProvider
+from quart_cors import cors
+from werkzeug.exceptions import RequestEntityTooLarge
+import gzip
+import hashlib
 import json
+import logging
+import logging.handlers
+import orjson
 import os
+import pickle
+import queue
+import redis
 from datetime import datetime
 
 from instagram_scraper import InstagramScraper
@@ -17,79 +30,197 @@ from config import Config
 import asyncio
 from lovable_automation import LovableService
 
-app = Flask(__name__, template_folder='templates', static_folder='static')
-CORS(app)
+# Log through a queue so slow handler I/O never blocks request handlers
+_log_queue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s %(levelname)s %(name)s %(message)s')
+)
+_log_listener = logging.handlers.QueueListener(_log_queue, _stream_handler)
+_log_listener.start()
+logging.basicConfig(
+    level=logging.INFO,
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
+)
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson's native-code encoder/decoder"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app = Quart(__name__, template_folder='templates', static_folder='static')
+app.json = OrjsonProvider(app)
+# API bodies are tiny; cap them so oversized payloads can't tie up workers
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024
+app = cors(app)
+
+@app.errorhandler(RequestEntityTooLarge)
+async def handle_oversized_body(e):
+    """Reject bodies over MAX_CONTENT_LENGTH with a clean JSON 413"""
+    return jsonify({'error': 'Request body too large'}), 413
+
 
 # Initialize components
 db = Database()
 scraper = InstagramScraper()
 
-# Store active sessions in memory (in production, use Redis)
-active_sessions = {}
+# Session store - Redis so any worker can serve any request
+redis_client = redis.Redis.from_url(Config.REDIS_URL)
+
+
+def save_session(conversation):
+    """Persist a conversation session to Redis with TTL"""
+    redis_client.setex(
+        f"sess:{conversation.session_id}",
+        Config.SESSION_TTL,
+        pickle.dumps(conversation)
+    )
+
+
+def load_session(session_id):
+    """Load a conversation session from Redis, or None if expired/missing"""
+    raw = redis_client.get(f"sess:{session_id}")
+    if raw is None:
+        return None
+    return pickle.loads(raw)
+
+
+FALLBACK_HTML = '''
+<!DOCTYPE html>
+<html>
+<head><title>RevampSite</title></head>
+<body style="font-family: sans-serif; padding: 50px;">
+    <h1>RevampSite API Server</h1>
+    <p>The server is running!</p>
+    <p>API Endpoints:</p>
+    <ul>
+        <li>POST /api/start - Start new project</li>
+        <li>POST /api/chat - Send chat message</li>
+        <li>GET /api/project/&lt;id&gt; - Get project details</li>
+    </ul>
+    <p style="color: red;">Note: Template not found. Please check templates/index.html exists.</p>
+</body>
+</html>
+'''
+
+# The landing page is fully static, so read it from disk once at startup
+# instead of running it through Jinja on every request
+try:
+    with open(os.path.join('templates', 'index.html'), encoding='utf-8') as f:
+        INDEX_HTML = f.read()
+except OSError as e:
+    logger.warning(f"Template error: {e}")
+    INDEX_HTML = FALLBACK_HTML
+
+# Pre-encode and pre-compress once so / never compresses per request
+INDEX_BYTES = INDEX_HTML.encode('utf-8')
+INDEX_GZ = gzip.compress(INDEX_BYTES, 9)
 
 
 @app.route('/')
-def index():
+async def index():
     """Serve the main page"""
-    try:
-        return render_template('index.html')
-    except Exception as e:
-        print(f"Template error: {e}")
-        return '''
-        <!DOCTYPE html>
-        <html>
-        <head><title>RevampSite</title></head>
-        <body style="font-family: sans-serif; padding: 50px;">
-            <h1>RevampSite API Server</h1>
-            <p>The server is running!</p>
-            <p>API Endpoints:</p>
-            <ul>
-                <li>POST /api/start - Start new project</li>
-                <li>POST /api/chat - Send chat message</li>
-                <li>GET /api/project/&lt;id&gt; - Get project details</li>
-            </ul>
-            <p style="color: red;">Note: Template not found. Please check templates/index.html exists.</p>
-        </body>
-        </html>
-        '''
+    headers = {
+        'Cache-Control': 'public, max-age=3600',
+        'Vary': 'Accept-Encoding'
+    }
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        headers['Content-Encoding'] = 'gzip'
+        return Response(INDEX_GZ, mimetype='text/html', headers=headers)
+    return Response(INDEX_BYTES, mimetype='text/html', headers=headers)
 
 
 @app.route('/api/start', methods=['POST'])
-def start_project():
-    """Start a new project with Instagram username"""
+async def start_project():
+    """Start a new project; the Instagram scrape runs in the background"""
     try:
-        data = request.json
+        data = await request.get_json(silent=True) or {}
         instagram_username = data.get('instagram_username', '').strip().replace('@', '')
-        
+
         if not instagram_username:
             return jsonify({'error': 'Instagram username is required'}), 400
-        
+
         # Create project in database
         project_id = db.create_project(instagram_username)
-        
-        # Scrape Instagram data
-        print(f"Scraping Instagram profile: @{instagram_username}")
-        instagram_data = scraper.get_full_profile_analysis(instagram_username)
-        
+
+        # Phase 2 runs off the request path - the scrape can take seconds
+        app.add_background_task(_run_scrape, project_id, instagram_username)
+
+        return jsonify({
+            'success': True,
+            'project_id': project_id,
+            'status': 'scraping',
+            'status_url': f'/api/start/status/{project_id}'
+        }), 202
+
+    except RequestEntityTooLarge:
+        raise  # let the 413 handler answer, not the blanket 500
+    except Exception as e:
+        logger.exception("Error starting project")
+        return jsonify({'error': str(e)}), 500
+
+
+def _store_start_result(project_id, payload):
+    """Stash the outcome of a start job for the status endpoint"""
+    redis_client.setex(f"start:{project_id}", Config.SESSION_TTL, json.dumps(payload))
+
+
+async def _run_scrape(project_id, instagram_username):
+    """Background task: scrape the profile and set up the conversation"""
+    try:
+        # Scrape Instagram data, with a short-TTL Redis cache so repeat
+        # starts on the same username are instant and don't burn
+        # Instagram rate-limit budget
+        cache_key = f"ig:{instagram_username}"
+        cached = redis_client.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached Instagram data for @{instagram_username}")
+            profile_json = cached.decode()
+            instagram_data = json.loads(cached)
+        else:
+            # Blocking httpx client, so run in a thread
+            logger.info(f"Scraping Instagram profile: @{instagram_username}")
+            instagram_data = await asyncio.to_thread(
+                scraper.get_full_profile_analysis, instagram_username
+            )
+            profile_json = None
+            if instagram_data:
+                # Encode once; the same bytes feed the cache and the DB
+                profile_json = json.dumps(instagram_data)
+                redis_client.setex(cache_key, Config.SCRAPE_CACHE_TTL, profile_json)
+
         if not instagram_data:
-            return jsonify({'error': 'Failed to fetch Instagram profile. Please check the username.'}), 404
-        
-        # Save Instagram data to database
-        db.save_instagram_data(
+            db.update_project_status(project_id, 'scrape_failed')
+            _store_start_result(project_id, {
+                'status': 'failed',
+                'error': 'Failed to fetch Instagram profile. Please check the username.'
+            })
+            return
+
+        # Save Instagram data and mark the project scraped in one commit
+        db.record_scrape(
             project_id,
-            instagram_data,
+            profile_json,
             instagram_data.get('brand_colors', []),
             instagram_data.get('business_info', {})
         )
-        
+
         # Initialize conversation
         conversation = ConversationManager(project_id)
         conversation_state = conversation.start_conversation(instagram_data)
-        
-        # Store session in memory
-        active_sessions[conversation.session_id] = conversation
-        
-        return jsonify({
+
+        # Store session in Redis
+        save_session(conversation)
+
+        _store_start_result(project_id, {
+            'status': 'ready',
             'success': True,
             'project_id': project_id,
             'session_id': conversation.session_id,
@@ -102,55 +233,91 @@ def start_project():
             },
             'conversation': conversation_state
         })
-    
+
+    except Exception as e:
+        logger.exception("Error starting project")
+        _store_start_result(project_id, {'status': 'failed', 'error': str(e)})
+
+
+@app.route('/api/start/status/<project_id>', methods=['GET'])
+async def start_status(project_id):
+    """Poll for the outcome of a two-phase /api/start"""
+    try:
+        raw = redis_client.get(f"start:{project_id}")
+        if raw is None:
+            if not db.get_project(project_id):
+                return jsonify({'error': 'Project not found'}), 404
+            return jsonify({'project_id': project_id, 'status': 'scraping'})
+        return jsonify(json.loads(raw))
+
     except Exception as e:
-        print(f"Error starting project: {str(e)}")
+        logger.exception("Error getting start status")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/chat', methods=['POST'])
-def chat():
+async def chat():
     """Handle chat messages"""
     try:
-        data = request.json
+        data = await request.get_json(silent=True) or {}
         session_id = data.get('session_id')
         user_input = data.get('message', '').strip()
         
-        if not session_id or session_id not in active_sessions:
+        if not session_id:
             return jsonify({'error': 'Invalid or expired session'}), 400
-        
-        # Get conversation manager
-        conversation = active_sessions[session_id]
-        
+
+        # Get conversation manager from Redis
+        conversation = load_session(session_id)
+        if conversation is None:
+            return jsonify({'error': 'Invalid or expired session'}), 400
+
         # Process user input
         response = conversation.process_user_input(user_input)
+
+        # Write updated state back so other workers see it
+        save_session(conversation)
         
         # If complete, save requirements and generate prompt
         if response.get('is_complete'):
             requirements = response.get('requirements')
             if requirements:
-                # Save to database
-                db.save_requirements(conversation.project_id, requirements)
-                
                 # Generate Lovable prompt
                 lovable_prompt = conversation.collector.generate_lovable_prompt()
                 response['lovable_prompt'] = lovable_prompt
-                
-                # Save prompt to database
-                db.save_generated_content(conversation.project_id, lovable_prompt)
-                
-                # Update project status
-                db.update_project_status(conversation.project_id, 'requirements_collected')
+
+                # Persist requirements, prompt and status in one commit
+                with db.transaction():
+                    db.save_requirements(conversation.project_id, requirements)
+                    db.save_generated_content(conversation.project_id, lovable_prompt)
+                    db.update_project_status(conversation.project_id, 'requirements_collected')
         
         return jsonify(response)
     
+    except RequestEntityTooLarge:
+        raise  # let the 413 handler answer, not the blanket 500
     except Exception as e:
-        print(f"Error in chat: {str(e)}")
+        logger.exception("Error in chat")
         return jsonify({'error': str(e)}), 500
 
 
+def json_response_with_etag(payload):
+    """Serialize once, attach an ETag, and answer If-None-Match with 304"""
+    body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    if etag in request.if_none_match:
+        return Response('', status=304, headers={'ETag': etag})
+    return Response(body, mimetype='application/json', headers={'ETag': etag})
+
+
+@app.route('/api/session/<session_id>/close', methods=['POST'])
+async def close_session(session_id):
+    """Explicitly drop a finished session instead of waiting for TTL expiry"""
+    redis_client.delete(f"sess:{session_id}")
+    return jsonify({'success': True})
+
+
 @app.route('/api/project/<project_id>', methods=['GET'])
-def get_project(project_id):
+async def get_project(project_id):
     """Get project details"""
     try:
         project = db.get_project(project_id)
@@ -160,31 +327,31 @@ def get_project(project_id):
         instagram_data = db.get_instagram_data(project_id)
         requirements = db.get_requirements(project_id)
         
-        return jsonify({
+        return json_response_with_etag({
             'project': project,
             'instagram_data': instagram_data,
             'requirements': requirements
         })
     
     except Exception as e:
-        print(f"Error getting project: {str(e)}")
+        logger.exception("Error getting project")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/projects', methods=['GET'])
-def get_projects():
+async def get_projects():
     """Get all projects"""
     try:
         projects = db.get_all_projects(limit=50)
-        return jsonify({'projects': projects})
+        return json_response_with_etag({'projects': projects})
     
     except Exception as e:
-        print(f"Error getting projects: {str(e)}")
+        logger.exception("Error getting projects")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/generate_prompt/<project_id>', methods=['GET'])
-def generate_prompt(project_id):
+async def generate_prompt(project_id):
     """Generate Lovable prompt for a project"""
     try:
         # Get project data
@@ -195,27 +362,21 @@ def generate_prompt(project_id):
             return jsonify({'error': 'Missing data for prompt generation'}), 400
         
         # Create collector and generate prompt
-        collector = RequirementsCollector()
-        collector.set_instagram_data(instagram_data['profile_data'])
-        collector.collected_data = {
-            k: v for k, v in requirements.items() 
-            if k in ['brand_name', 'tone_keywords', 'target_audience', 'primary_color', 'main_goal']
-        }
-        
+        collector = build_collector(instagram_data, requirements)
         lovable_prompt = collector.generate_lovable_prompt()
-        
-        return jsonify({
+
+        return json_response_with_etag({
             'project_id': project_id,
             'lovable_prompt': lovable_prompt
         })
     
     except Exception as e:
-        print(f"Error generating prompt: {str(e)}")
+        logger.exception("Error generating prompt")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/generate/<project_id>', methods=['POST'])
-def generate_website(project_id):
+async def generate_website(project_id):
     """Generate website using Lovable automation"""
     try:
         # Get project data
@@ -231,13 +392,7 @@ def generate_website(project_id):
             return jsonify({'error': 'Requirements not collected yet'}), 400
         
         # Create collector and generate prompt
-        collector = RequirementsCollector()
-        collector.set_instagram_data(instagram_data['profile_data'])
-        collector.collected_data = {
-            k: v for k, v in requirements.items() 
-            if k in ['brand_name', 'tone_keywords', 'target_audience', 'primary_color', 'main_goal']
-        }
-        
+        collector = build_collector(instagram_data, requirements)
         lovable_prompt = collector.generate_lovable_prompt()
         
         # Check for Lovable credentials
@@ -250,24 +405,68 @@ def generate_website(project_id):
                 'message': 'Please set LOVABLE_EMAIL and LOVABLE_PASSWORD environment variables'
             }), 500
         
-        # Run Lovable automation
-        service = LovableService(email, password)
-        
-        # Run async function in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            service.generate_from_requirements(
-                project_id=project_id,
-                prompt=lovable_prompt,
-                headless=True  # Run headless in production
-            )
+        # Record the pending job, then run the automation in the
+        # background - it can take minutes and must not pin a worker
+        db.save_generated_content(project_id, lovable_prompt, None, 'pending')
+        db.update_project_status(project_id, 'generating')
+        app.add_background_task(
+            _run_generation, project_id, lovable_prompt, email, password
         )
-        
+
+        return jsonify({
+            'success': True,
+            'project_id': project_id,
+            'status': 'generating',
+            'status_url': f'/api/generate/status/{project_id}'
+        }), 202
+
+    except Exception as e:
+        logger.exception("Error generating website")
+        return jsonify({'error': str(e)}), 500
+
+
+# Requirement columns that feed prompt generation
+PROMPT_KEYS = frozenset((
+    'brand_name', 'tone_keywords', 'target_audience', 'primary_color', 'main_goal'
+))
+
+
+def build_collector(instagram_data, requirements):
+    """Build a RequirementsCollector primed with stored project data"""
+    collector = RequirementsCollector()
+    collector.set_instagram_data(instagram_data['profile_data'])
+    collector.collected_data = {
+        k: requirements[k] for k in PROMPT_KEYS if k in requirements
+    }
+    return collector
+
+
+# Shared across requests so repeat generations don't rebuild the service
+_lovable_service = None
+
+
+def get_lovable_service(email, password):
+    """Get the shared LovableService, creating it on first use"""
+    global _lovable_service
+    if _lovable_service is None:
+        _lovable_service = LovableService(email, password)
+    return _lovable_service
+
+
+async def _run_generation(project_id, lovable_prompt, email, password):
+    """Background task: run Lovable automation and record the outcome"""
+    try:
+        service = get_lovable_service(email, password)
+        result = await service.generate_from_requirements(
+            project_id=project_id,
+            prompt=lovable_prompt,
+            headless=True  # Run headless in production
+        )
+
         # Update database with results
         if result['success']:
             db.update_project_status(
-                project_id, 
+                project_id,
                 'website_generated',
                 preview_url=result['preview_url']
             )
@@ -285,16 +484,34 @@ def generate_website(project_id):
                 'failed',
                 result.get('error')
             )
-        
-        return jsonify(result)
-        
+
+    except Exception as e:
+        logger.exception("Error generating website")
+        db.save_generated_content(project_id, lovable_prompt, None, 'failed', str(e))
+
+
+@app.route('/api/generate/status/<project_id>', methods=['GET'])
+async def generate_status(project_id):
+    """Poll generation status for a project"""
+    try:
+        content = db.get_generated_content(project_id)
+        if not content:
+            return jsonify({'error': 'No generation job for this project'}), 404
+
+        return jsonify({
+            'project_id': project_id,
+            'status': content['generation_status'],
+            'preview_url': content['preview_url'],
+            'error': content['error_message']
+        })
+
     except Exception as e:
-        print(f"Error generating website: {str(e)}")
+        logger.exception("Error getting generation status")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/health', methods=['GET'])
-def health():
+async def health():
     """Health check endpoint"""
     return jsonify({'status': 'healthy', 'service': 'RevampSite API'})
 
@@ -317,5 +534,6 @@ if __name__ == '__main__':
     print("  GET /api/projects - Get all projects")
     print("  GET /health - Health check")
     print("=" * 60)
-    
-    app.run(debug=True, port=5001, host='0.0.0.0')
\ No newline at end of file
+
+    # Dev server only - production runs under hypercorn (see Dockerfile)
+    app.run(debug=Config.DEBUG, port=5001, host='0.0.0.0')
\ No newline at end of file
@@ -3,6 +3,7 @@ Configuration settings for RevampSite
 """
 
 import os
+from itertools import cycle
 from typing import List, Optional
 
 class Config:
@@ -40,17 +41,26 @@ class Config:
     
     # Database
     DATABASE_PATH = os.getenv("DATABASE_PATH", "revampsite.db")
+
+    # Redis (session store)
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    SESSION_TTL = 3600  # 1 hour in seconds
+    SCRAPE_CACHE_TTL = 600  # 10 minutes - follower counts go stale fast
     
     # Output Settings
     OUTPUT_DIR = os.getenv("OUTPUT_DIR", "output")
     TEMP_DIR = os.getenv("TEMP_DIR", "temp")
     
+    # Lazily built round-robin iterator over PROXY_LIST
+    _proxy_cycle = None
+
     @classmethod
     def get_proxy(cls) -> Optional[str]:
-        """Get a random proxy from the list"""
+        """Get the next proxy from the list, round-robin"""
         if cls.USE_PROXY and cls.PROXY_LIST:
-            import random
-            return random.choice(cls.PROXY_LIST)
+            if cls._proxy_cycle is None:
+                cls._proxy_cycle = cycle(cls.PROXY_LIST)
+            return next(cls._proxy_cycle)
         return None
     
     @classmethod
@@ -6,158 +6,459 @@ Handles storage of scraped data and user requirements
 
 import sqlite3
 import json
+import queue
+import secrets
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import combinations
+from time import monotonic
 from typing import Dict, List, Optional
 import os
 
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    # orjson is in requirements.txt, but keep the module importable
+    # without it (scripts, stripped-down environments)
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Sentinel distinguishing "not cached" from a cached None
+_CACHE_MISS = object()
+
+# Explicit column lists: reads zip these with plain tuples, which skips
+# sqlite3.Row construction per row and pins the schema the API returns
+PROJECT_COLS = (
+    'id', 'project_id', 'instagram_username', 'created_at', 'updated_at',
+    'status', 'preview_url', 'final_url', 'payment_status', 'payment_id'
+)
+INSTAGRAM_DATA_COLS = (
+    'id', 'project_id', 'profile_data', 'brand_colors', 'business_info',
+    'scraped_at'
+)
+REQUIREMENT_COLS = (
+    'id', 'project_id', 'brand_name', 'primary_color', 'tone_keywords',
+    'target_audience', 'reference_sites', 'language', 'additional_notes',
+    'collected_at'
+)
+GENERATED_CONTENT_COLS = (
+    'id', 'project_id', 'lovable_prompt', 'preview_url',
+    'generation_status', 'generated_at', 'error_message'
+)
+
+# Optional columns update_project_status may set alongside status
+_STATUS_FIELDS = ('preview_url', 'final_url', 'payment_status', 'payment_id')
+
+
+def _build_update_sql():
+    """Pre-build an UPDATE statement for every allowed field combination
+
+    Static SQL text per combination keeps the prepared-statement cache
+    hitting and keeps column names out of runtime string assembly.
+    """
+    table = {}
+    for n in range(len(_STATUS_FIELDS) + 1):
+        for combo in combinations(_STATUS_FIELDS, n):
+            sets = ['status = ?', 'updated_at = CURRENT_TIMESTAMP']
+            sets.extend(f'{field} = ?' for field in combo)
+            table[combo] = (
+                f"UPDATE projects SET {', '.join(sets)} WHERE project_id = ?"
+            )
+    return table
+
+
+_UPDATE_PROJECT_SQL = _build_update_sql()
+
+# Statement text built once at import; methods pass identical strings on
+# every call, so sqlite3's per-connection statement cache always hits
+_SCHEMA_DDL = '''
+    -- Projects table - main table for each website project
+    CREATE TABLE IF NOT EXISTS projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id TEXT UNIQUE NOT NULL,
+        instagram_username TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'pending',
+        preview_url TEXT,
+        final_url TEXT,
+        payment_status TEXT DEFAULT 'unpaid',
+        payment_id TEXT
+    );
+
+    -- Instagram data table - stores scraped Instagram data
+    CREATE TABLE IF NOT EXISTS instagram_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id TEXT NOT NULL,
+        profile_data TEXT NOT NULL,
+        brand_colors TEXT,
+        business_info TEXT,
+        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (project_id) REFERENCES projects(project_id)
+    );
+
+    -- Requirements table - stores user requirements
+    CREATE TABLE IF NOT EXISTS requirements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id TEXT NOT NULL,
+        brand_name TEXT,
+        primary_color TEXT,
+        tone_keywords TEXT,
+        target_audience TEXT,
+        reference_sites TEXT,
+        language TEXT DEFAULT 'en',
+        additional_notes TEXT,
+        collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (project_id) REFERENCES projects(project_id)
+    );
+
+    -- Chat sessions table - stores conversation history
+    CREATE TABLE IF NOT EXISTS chat_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id TEXT NOT NULL,
+        session_id TEXT UNIQUE NOT NULL,
+        messages TEXT,
+        started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        ended_at TIMESTAMP,
+        FOREIGN KEY (project_id) REFERENCES projects(project_id)
+    );
+
+    -- Generated content table - stores Lovable prompts and results
+    CREATE TABLE IF NOT EXISTS generated_content (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id TEXT NOT NULL,
+        lovable_prompt TEXT NOT NULL,
+        preview_url TEXT,
+        generation_status TEXT DEFAULT 'pending',
+        generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        error_message TEXT,
+        FOREIGN KEY (project_id) REFERENCES projects(project_id)
+    );
+
+    -- Composite indexes so the "latest row for project" lookups hit an
+    -- index instead of scanning and sorting the child tables
+    CREATE INDEX IF NOT EXISTS idx_instagram_data_pid_time
+    ON instagram_data(project_id, scraped_at DESC);
+
+    CREATE INDEX IF NOT EXISTS idx_requirements_pid_time
+    ON requirements(project_id, collected_at DESC);
+
+    CREATE INDEX IF NOT EXISTS idx_generated_pid_time
+    ON generated_content(project_id, generated_at DESC);
+
+    CREATE INDEX IF NOT EXISTS idx_chat_sessions_pid
+    ON chat_sessions(project_id);
+'''
+
+_SQL_INSERT_PROJECT = '''
+    INSERT INTO projects (project_id, instagram_username)
+    VALUES (?, ?)
+'''
+_SQL_INSERT_INSTAGRAM_DATA = '''
+    INSERT INTO instagram_data (project_id, profile_data, brand_colors, business_info)
+    VALUES (?, ?, ?, ?)
+'''
+_SQL_INSERT_REQUIREMENTS = '''
+    INSERT INTO requirements (
+        project_id, brand_name, primary_color, tone_keywords,
+        target_audience, reference_sites, language, additional_notes
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_UPSERT_CHAT_SESSION = '''
+    INSERT INTO chat_sessions (project_id, session_id, messages)
+    VALUES (?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        messages = excluded.messages,
+        ended_at = CURRENT_TIMESTAMP
+'''
+_SQL_INSERT_GENERATED_CONTENT = '''
+    INSERT INTO generated_content
+    (project_id, lovable_prompt, preview_url, generation_status, error_message)
+    VALUES (?, ?, ?, ?, ?)
+'''
+_SQL_SELECT_PROJECT = f'''
+    SELECT {", ".join(PROJECT_COLS)} FROM projects WHERE project_id = ?
+'''
+_SQL_SELECT_INSTAGRAM_DATA = f'''
+    SELECT {", ".join(INSTAGRAM_DATA_COLS)} FROM instagram_data
+    WHERE project_id = ?
+    ORDER BY scraped_at DESC, id DESC LIMIT 1
+'''
+_SQL_SELECT_PROFILE_USERNAME = '''
+    SELECT json_extract(profile_data, '$.username')
+    FROM instagram_data
+    WHERE project_id = ?
+    ORDER BY scraped_at DESC, id DESC LIMIT 1
+'''
+_SQL_SELECT_REQUIREMENTS = f'''
+    SELECT {", ".join(REQUIREMENT_COLS)} FROM requirements
+    WHERE project_id = ?
+    ORDER BY collected_at DESC, id DESC LIMIT 1
+'''
+_SQL_SELECT_GENERATED_CONTENT = f'''
+    SELECT {", ".join(GENERATED_CONTENT_COLS)} FROM generated_content
+    WHERE project_id = ?
+    ORDER BY generated_at DESC, id DESC LIMIT 1
+'''
+_SQL_SELECT_ALL_PROJECTS = f'''
+    SELECT {", ".join(PROJECT_COLS)} FROM projects
+    ORDER BY created_at DESC
+    LIMIT ?
+'''
+
 class Database:
     """SQLite database manager for RevampSite"""
-    
+
+    READ_CACHE_TTL = 60  # seconds
+    READ_CACHE_MAX = 1024  # entries
+
+    WRITE_BATCH_MAX = 64  # statements per background commit
+    WRITE_BATCH_WINDOW = 0.05  # seconds to wait for more work
+
     def __init__(self, db_path: str = "revampsite.db"):
         """Initialize database connection"""
         self.db_path = db_path
+        self._local = threading.local()
+        self._read_cache = {}
+        # SQLite allows one writer at a time; serialize in Python rather
+        # than burning the busy timeout. RLock so transaction() can nest
+        # the single-statement writers.
+        self._write_lock = threading.RLock()
+        # Background writer: started lazily on the first *_async call so
+        # short-lived scripts never pay for the extra thread
+        self._write_queue = queue.SimpleQueue()
+        self._writer_started = False
+        self._writer_start_lock = threading.Lock()
         self.init_database()
-    
+
+    def _cache_get(self, kind: str, project_id: str):
+        """Get a cached read result, or _CACHE_MISS if absent/expired"""
+        entry = self._read_cache.get((kind, project_id))
+        if entry is not None:
+            value, expires = entry
+            if expires > monotonic():
+                return value
+            self._read_cache.pop((kind, project_id), None)
+        return _CACHE_MISS
+
+    def _cache_put(self, kind: str, project_id: str, value):
+        """Cache a read result with TTL, clearing the cache if it gets too big"""
+        if len(self._read_cache) >= self.READ_CACHE_MAX:
+            self._read_cache.clear()
+        self._read_cache[(kind, project_id)] = (value, monotonic() + self.READ_CACHE_TTL)
+
+    def _cache_invalidate(self, kind: str, project_id: str):
+        """Drop a cached read result after a write"""
+        self._read_cache.pop((kind, project_id), None)
+
     def get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get this thread's persistent database connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Large statement cache: connections live for the thread's
+            # lifetime, so compiled statements get reused across calls
+            conn = sqlite3.connect(self.db_path, cached_statements=256)
+            self._apply_pragmas(conn)
+            self._local.conn = conn
         return conn
+
+    def _apply_pragmas(self, conn):
+        """Tune a fresh connection for concurrent read/write workloads"""
+        if self.db_path != ":memory:":
+            # WAL lets readers proceed while a write is in flight;
+            # NORMAL sync drops one fsync per commit (safe with WAL)
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # ~64MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB
+        conn.execute("PRAGMA busy_timeout=5000")
+
+    def close(self):
+        """Close this thread's connection (tests/shutdown)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def transaction(self):
+        """Group several save_*/update_* calls into a single commit"""
+        with self._write_lock:
+            conn = self.get_connection()
+            self._local.in_transaction = True
+            try:
+                yield self
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._local.in_transaction = False
+
+    def _commit(self, conn):
+        """Commit now, unless inside an explicit transaction() block"""
+        if not getattr(self._local, 'in_transaction', False):
+            conn.commit()
+
+    def _execute_write(self, sql, params):
+        """Run a single write statement under the writer lock"""
+        with self._write_lock:
+            conn = self.get_connection()
+            conn.execute(sql, params)
+            self._commit(conn)
+
+    def _ensure_writer(self):
+        """Start the background writer thread on first use"""
+        if not self._writer_started:
+            with self._writer_start_lock:
+                if not self._writer_started:
+                    threading.Thread(target=self._writer_loop,
+                                     name='db-writer', daemon=True).start()
+                    self._writer_started = True
+
+    def _enqueue_write(self, sql, params) -> Future:
+        """Queue a write for the background thread
+
+        Returns a Future that resolves once the statement's batch has
+        committed, so callers that need durability can wait on it while
+        fire-and-forget callers just drop it.
+        """
+        future = Future()
+
+        # A ":memory:" database lives inside the connection that opened
+        # it; the writer thread's thread-local connection would be a
+        # separate empty database and every write would fail with
+        # "no such table". Run those writes synchronously instead.
+        if self.db_path == ":memory:":
+            try:
+                self._execute_write(sql, params)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(None)
+            return future
+
+        self._ensure_writer()
+        self._write_queue.put((sql, params, future))
+        return future
+
+    def _writer_loop(self):
+        """Drain queued writes, batching several per commit
+
+        Collects up to WRITE_BATCH_MAX statements or whatever arrives
+        within WRITE_BATCH_WINDOW, then commits them together - one
+        fsync amortized over the batch instead of one per write.
+        """
+        while True:
+            batch = [self._write_queue.get()]
+            deadline = monotonic() + self.WRITE_BATCH_WINDOW
+            while len(batch) < self.WRITE_BATCH_MAX:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            with self._write_lock:
+                conn = self.get_connection()
+                try:
+                    for sql, params, _ in batch:
+                        conn.execute(sql, params)
+                    conn.commit()
+                except Exception as exc:
+                    conn.rollback()
+                    for _, _, future in batch:
+                        future.set_exception(exc)
+                    continue
+
+            for _, _, future in batch:
+                future.set_result(None)
     
     def init_database(self):
         """Initialize database tables"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Projects table - main table for each website project
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id TEXT UNIQUE NOT NULL,
-                instagram_username TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status TEXT DEFAULT 'pending',
-                preview_url TEXT,
-                final_url TEXT,
-                payment_status TEXT DEFAULT 'unpaid',
-                payment_id TEXT
-            )
-        ''')
-        
-        # Instagram data table - stores scraped Instagram data
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS instagram_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id TEXT NOT NULL,
-                profile_data TEXT NOT NULL,
-                brand_colors TEXT,
-                business_info TEXT,
-                scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (project_id) REFERENCES projects(project_id)
-            )
-        ''')
-        
-        # Requirements table - stores user requirements
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS requirements (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id TEXT NOT NULL,
-                brand_name TEXT,
-                primary_color TEXT,
-                tone_keywords TEXT,
-                target_audience TEXT,
-                reference_sites TEXT,
-                language TEXT DEFAULT 'en',
-                additional_notes TEXT,
-                collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (project_id) REFERENCES projects(project_id)
-            )
-        ''')
-        
-        # Chat sessions table - stores conversation history
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chat_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id TEXT NOT NULL,
-                session_id TEXT UNIQUE NOT NULL,
-                messages TEXT,
-                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                ended_at TIMESTAMP,
-                FOREIGN KEY (project_id) REFERENCES projects(project_id)
-            )
-        ''')
-        
-        # Generated content table - stores Lovable prompts and results
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS generated_content (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id TEXT NOT NULL,
-                lovable_prompt TEXT NOT NULL,
-                preview_url TEXT,
-                generation_status TEXT DEFAULT 'pending',
-                generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                error_message TEXT,
-                FOREIGN KEY (project_id) REFERENCES projects(project_id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+
+        # One round-trip through the SQL parser; executescript commits
+        # the whole batch itself
+        conn.executescript(_SCHEMA_DDL)
+
+        # Refresh planner statistics so the new indexes get picked
+        conn.execute('ANALYZE')
+        self._commit(conn)
     
     def create_project(self, instagram_username: str) -> str:
         """Create a new project"""
-        import hashlib
-        import time
-        
-        # Generate unique project ID
-        timestamp = str(time.time())
-        project_id = hashlib.md5(f"{instagram_username}_{timestamp}".encode()).hexdigest()[:12]
-        
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO projects (project_id, instagram_username)
-            VALUES (?, ?)
-        ''', (project_id, instagram_username))
-        
-        conn.commit()
-        conn.close()
-        
+        # 48 random bits straight from the OS - no hashing or formatting
+        project_id = secrets.token_hex(6)
+
+        self._execute_write(_SQL_INSERT_PROJECT, (project_id, instagram_username))
+
         return project_id
     
-    def save_instagram_data(self, project_id: str, profile_data: Dict, 
+    def save_instagram_data(self, project_id: str, profile_data,
                            brand_colors: List, business_info: Dict):
-        """Save Instagram scraped data"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO instagram_data (project_id, profile_data, brand_colors, business_info)
-            VALUES (?, ?, ?, ?)
-        ''', (
-            project_id,
-            json.dumps(profile_data),
-            json.dumps(brand_colors),
-            json.dumps(business_info)
-        ))
-        
-        conn.commit()
-        conn.close()
+        """Save Instagram scraped data
+
+        profile_data may be a dict or a pre-serialized JSON string, so
+        callers that already hold the encoded payload (e.g. from the
+        scrape cache) don't pay for a second encode.
+        """
+        self.save_instagram_data_many(
+            [(project_id, profile_data, brand_colors, business_info)]
+        )
+
+    def save_instagram_data_many(self, rows: List[tuple]):
+        """Save several Instagram scrape results in one commit
+
+        rows: list of (project_id, profile_data, brand_colors,
+        business_info) tuples; profile_data may be a dict or JSON string.
+        """
+        params = [
+            (
+                project_id,
+                profile_data if isinstance(profile_data, str) else _json_dumps(profile_data),
+                _json_dumps(brand_colors),
+                _json_dumps(business_info)
+            )
+            for project_id, profile_data, brand_colors, business_info in rows
+        ]
+
+        with self._write_lock:
+            conn = self.get_connection()
+            conn.executemany(_SQL_INSERT_INSTAGRAM_DATA, params)
+            self._commit(conn)
+
+        for row in rows:
+            self._cache_invalidate('instagram_data', row[0])
     
+    def record_scrape(self, project_id: str, profile_data,
+                      brand_colors: List, business_info: Dict,
+                      status: str = 'scraped', **status_fields):
+        """Save a scrape result and advance the project status in one commit
+
+        Combines save_instagram_data and update_project_status under a
+        single transaction, so a scrape either lands fully (data plus
+        status) or not at all, and the WAL gets one fsync instead of two.
+        """
+        with self.transaction():
+            self.save_instagram_data(project_id, profile_data,
+                                     brand_colors, business_info)
+            self.update_project_status(project_id, status, **status_fields)
+
     def save_requirements(self, project_id: str, requirements: Dict):
         """Save user requirements"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO requirements (
-                project_id, brand_name, primary_color, tone_keywords,
-                target_audience, reference_sites, language, additional_notes
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        self._execute_write(_SQL_INSERT_REQUIREMENTS, (
             project_id,
             requirements.get('brand_name'),
             requirements.get('primary_color'),
@@ -167,132 +468,153 @@ class Database:
             requirements.get('language', 'en'),
             requirements.get('additional_notes')
         ))
-        
-        conn.commit()
-        conn.close()
+
+        self._cache_invalidate('requirements', project_id)
     
     def get_project(self, project_id: str) -> Optional[Dict]:
         """Get project details"""
+        cached = self._cache_get('project', project_id)
+        if cached is not _CACHE_MISS:
+            return cached
+
         conn = self.get_connection()
         cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM projects WHERE project_id = ?
-        ''', (project_id,))
-        
+
+        cursor.execute(_SQL_SELECT_PROJECT, (project_id,))
+
         row = cursor.fetchone()
-        conn.close()
-        
+
         if row:
-            return dict(row)
+            result = dict(zip(PROJECT_COLS, row))
+            self._cache_put('project', project_id, result)
+            return result
         return None
     
     def get_instagram_data(self, project_id: str) -> Optional[Dict]:
         """Get Instagram data for a project"""
+        cached = self._cache_get('instagram_data', project_id)
+        if cached is not _CACHE_MISS:
+            return cached
+
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT * FROM instagram_data WHERE project_id = ?
-            ORDER BY scraped_at DESC LIMIT 1
-        ''', (project_id,))
-        
+        cursor.execute(_SQL_SELECT_INSTAGRAM_DATA, (project_id,))
+
         row = cursor.fetchone()
-        conn.close()
-        
+
         if row:
-            data = dict(row)
-            data['profile_data'] = json.loads(data['profile_data'])
-            data['brand_colors'] = json.loads(data['brand_colors']) if data['brand_colors'] else []
-            data['business_info'] = json.loads(data['business_info']) if data['business_info'] else {}
+            data = dict(zip(INSTAGRAM_DATA_COLS, row))
+            data['profile_data'] = _json_loads(data['profile_data'])
+            data['brand_colors'] = _json_loads(data['brand_colors']) if data['brand_colors'] else []
+            data['business_info'] = _json_loads(data['business_info']) if data['business_info'] else {}
+            self._cache_put('instagram_data', project_id, data)
             return data
         return None
     
+    def get_profile_username(self, project_id: str) -> Optional[str]:
+        """Get just the scraped profile's username
+
+        Projects the single field with json_extract inside SQLite, so
+        callers that only need the handle don't pull and parse the full
+        profile_data payload.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(_SQL_SELECT_PROFILE_USERNAME, (project_id,))
+
+        row = cursor.fetchone()
+        return row[0] if row else None
+
     def get_requirements(self, project_id: str) -> Optional[Dict]:
         """Get requirements for a project"""
+        cached = self._cache_get('requirements', project_id)
+        if cached is not _CACHE_MISS:
+            return cached
+
         conn = self.get_connection()
         cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM requirements WHERE project_id = ?
-            ORDER BY collected_at DESC LIMIT 1
-        ''', (project_id,))
-        
+
+        cursor.execute(_SQL_SELECT_REQUIREMENTS, (project_id,))
+
         row = cursor.fetchone()
-        conn.close()
-        
+
         if row:
-            return dict(row)
+            result = dict(zip(REQUIREMENT_COLS, row))
+            self._cache_put('requirements', project_id, result)
+            return result
         return None
     
     def update_project_status(self, project_id: str, status: str, **kwargs):
         """Update project status and optional fields"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        updates = ['status = ?', 'updated_at = CURRENT_TIMESTAMP']
+        fields = tuple(f for f in _STATUS_FIELDS if f in kwargs)
         values = [status]
-        
-        for key, value in kwargs.items():
-            if key in ['preview_url', 'final_url', 'payment_status', 'payment_id']:
-                updates.append(f'{key} = ?')
-                values.append(value)
-        
+        values.extend(kwargs[f] for f in fields)
         values.append(project_id)
-        
-        cursor.execute(f'''
-            UPDATE projects 
-            SET {', '.join(updates)}
-            WHERE project_id = ?
-        ''', values)
-        
-        conn.commit()
-        conn.close()
+
+        self._execute_write(_UPDATE_PROJECT_SQL[fields], values)
+
+        self._cache_invalidate('project', project_id)
     
     def save_chat_session(self, project_id: str, session_id: str, messages: List[Dict]):
         """Save chat session messages"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO chat_sessions (project_id, session_id, messages)
-            VALUES (?, ?, ?)
-            ON CONFLICT(session_id) DO UPDATE SET
-                messages = ?,
-                ended_at = CURRENT_TIMESTAMP
-        ''', (project_id, session_id, json.dumps(messages), json.dumps(messages)))
-        
-        conn.commit()
-        conn.close()
+        self.save_chat_sessions_many([(project_id, session_id, messages)])
+
+    def save_chat_sessions_many(self, rows: List[tuple]):
+        """Upsert several chat sessions in one commit
+
+        rows: list of (project_id, session_id, messages) tuples.
+        """
+        params = [
+            (project_id, session_id, _json_dumps(messages))
+            for project_id, session_id, messages in rows
+        ]
+
+        with self._write_lock:
+            conn = self.get_connection()
+            conn.executemany(_SQL_UPSERT_CHAT_SESSION, params)
+            self._commit(conn)
     
-    def save_generated_content(self, project_id: str, lovable_prompt: str, 
+    def save_chat_session_async(self, project_id: str, session_id: str,
+                                messages: List[Dict]) -> Future:
+        """Queue a chat-session upsert on the background writer
+
+        Serializes on the caller's thread, commits on the writer's.
+        The returned Future resolves when the batch lands on disk.
+        """
+        return self._enqueue_write(
+            _SQL_UPSERT_CHAT_SESSION,
+            (project_id, session_id, _json_dumps(messages))
+        )
+
+    def save_generated_content(self, project_id: str, lovable_prompt: str,
                               preview_url: str = None, status: str = 'pending',
                               error_message: str = None):
         """Save generated content information"""
+        self._execute_write(_SQL_INSERT_GENERATED_CONTENT,
+                            (project_id, lovable_prompt, preview_url, status, error_message))
+    
+    def get_generated_content(self, project_id: str) -> Optional[Dict]:
+        """Get latest generated content record for a project"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO generated_content 
-            (project_id, lovable_prompt, preview_url, generation_status, error_message)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (project_id, lovable_prompt, preview_url, status, error_message))
-        
-        conn.commit()
-        conn.close()
-    
+
+        cursor.execute(_SQL_SELECT_GENERATED_CONTENT, (project_id,))
+
+        row = cursor.fetchone()
+
+        if row:
+            return dict(zip(GENERATED_CONTENT_COLS, row))
+        return None
+
     def get_all_projects(self, limit: int = 50) -> List[Dict]:
         """Get all projects"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT * FROM projects 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        ''', (limit,))
-        
+        cursor.execute(_SQL_SELECT_ALL_PROJECTS, (limit,))
+
         rows = cursor.fetchall()
-        conn.close()
-        
-        return [dict(row) for row in rows]
\ No newline at end of file
+
+        return [dict(zip(PROJECT_COLS, row)) for row in rows]
\ No newline at end of file
@@ -4,20 +4,98 @@ Instagram Scraper for RevampSite
 Extracts profile data, posts, and brand elements from Instagram profiles
 """
 
+import asyncio
 import httpx
-import json
+import numpy as np
+import orjson
+import os
 import random
+import secrets
+import threading
 import time
 import re
+from itertools import cycle
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote
 import hashlib
 from PIL import Image
 from io import BytesIO
-import requests
 from collections import Counter
 from datetime import datetime
 
+try:
+    import redis
+except ImportError:
+    # Scraper stays usable as a standalone script without Redis
+    redis = None
+
+# Patterns compiled once at import: these run per profile (hashtags per
+# caption), so skip the per-call compile / re-cache lookup
+_HASHTAG_RE = re.compile(r'#(\w+)')
+_EMAIL_RE = re.compile(r'[\w._%+-]+@[\w.-]+\.[A-Z|a-z]{2,}')
+_PHONE_RE = re.compile(
+    r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,5}[-\s\.]?[0-9]{1,5}'
+)
+_WHATSAPP_RE = re.compile(r'whatsapp[:\s]+([+0-9\s-]+)', re.IGNORECASE)
+_SERVICE_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:we offer|offering|services|specializing in)[:\s]+([^.\n]+)',
+    r'✓\s*([^✓\n]+)',
+    r'•\s*([^•\n]+)',
+    r'[-]\s*([^-\n]+)',
+    r'\d+\.\s*([^.\n]+)'
+))
+_LOCATION_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'📍\s*([^\n]+)',
+    r'(?:located in|based in|from)\s+([^\n,.]+)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),?\s*(?:[A-Z]{2}|[A-Z][a-z]+)'
+))
+
+# Business type patterns
+_BIZ_PATTERNS = {
+    "restaurant": ["food", "menu", "restaurant", "cafe", "dining", "chef", "cuisine"],
+    "fashion": ["fashion", "style", "clothing", "boutique", "wear", "outfit", "collection"],
+    "beauty": ["beauty", "salon", "makeup", "hair", "skincare", "spa", "cosmetics"],
+    "fitness": ["fitness", "gym", "workout", "training", "yoga", "health", "wellness"],
+    "photography": ["photography", "photographer", "photo", "shoot", "camera", "portrait"],
+    "real_estate": ["real estate", "property", "realtor", "homes", "listing", "rent"],
+    "consulting": ["consulting", "consultant", "advisor", "strategy", "business", "coach"],
+    "art": ["art", "artist", "gallery", "painting", "design", "creative", "illustration"],
+    "education": ["education", "course", "training", "learn", "workshop", "tutorial"],
+    "tech": ["tech", "software", "app", "digital", "development", "coding", "startup"]
+}
+
+_TONE_INDICATORS = {
+    "professional": ["professional", "expert", "certified", "licensed", "qualified"],
+    "friendly": ["friendly", "welcome", "happy", "love", "❤️", "😊"],
+    "luxury": ["luxury", "premium", "exclusive", "vip", "elite"],
+    "casual": ["casual", "fun", "chill", "relax", "easy"],
+    "modern": ["modern", "innovative", "cutting-edge", "latest", "new"],
+    "traditional": ["traditional", "classic", "authentic", "original", "established"],
+    "minimal": ["minimal", "simple", "clean", "pure", "essential"],
+    "bold": ["bold", "vibrant", "dynamic", "powerful", "strong"]
+}
+
+
+def _keyword_scanner(patterns):
+    """Build a single-pass scanner for a {label: keywords} dict
+
+    Returns (regex, keyword -> labels map). One alternation (longest
+    keyword first, so prefixes don't shadow longer matches) replaces a
+    separate substring scan per keyword over the same text.
+    """
+    keyword_labels = {}
+    for label, keywords in patterns.items():
+        for keyword in keywords:
+            keyword_labels.setdefault(keyword, []).append(label)
+    alternation = '|'.join(
+        re.escape(k) for k in sorted(keyword_labels, key=len, reverse=True)
+    )
+    return re.compile(alternation), keyword_labels
+
+
+_BIZ_SCAN_RE, _BIZ_KEYWORD_LABELS = _keyword_scanner(_BIZ_PATTERNS)
+_TONE_SCAN_RE, _TONE_KEYWORD_LABELS = _keyword_scanner(_TONE_INDICATORS)
+
 class InstagramScraper:
     """Scrapes Instagram profiles without using official API"""
     
@@ -36,15 +114,55 @@ class InstagramScraper:
         
         # Initialize HTTP client
         self.client = self._create_client()
-        
-        # Cache for scraped data
+
+        # Per-request user-agent rotation
+        self._ua_cycle = cycle(self.user_agents)
+        
+        # Monotonic timestamp of the last real network request; lets
+        # _add_delay charge only the remainder of the pacing gap. The
+        # lock keeps the pacing honest when get_many_profile_analyses
+        # runs fetches on concurrent to_thread workers.
+        self._last_req_time = 0.0
+        self._req_pace_lock = threading.Lock()
+
+        # Cache for scraped data; backed by Redis when available so
+        # hits survive restarts and are shared between workers
         self.cache = {}
-        
+        self.redis = None
+        if redis is not None:
+            try:
+                self.redis = redis.Redis.from_url(
+                    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                    decode_responses=True
+                )
+            except Exception as e:
+                print(f"Redis cache unavailable, using in-memory cache: {str(e)}")
+
+    def _cache_get(self, cache_key: str):
+        """Look up a cached payload, preferring Redis"""
+        if self.redis is not None:
+            try:
+                cached = self.redis.get(cache_key)
+                if cached:
+                    return orjson.loads(cached)
+            except Exception as e:
+                # Redis outage degrades to the in-process dict
+                print(f"Redis cache read failed: {str(e)}")
+        return self.cache.get(cache_key)
+
+    def _cache_set(self, cache_key: str, value, ttl: int = 3600):
+        """Store a payload in the in-process dict and Redis (with TTL)"""
+        self.cache[cache_key] = value
+        if self.redis is not None:
+            try:
+                self.redis.setex(cache_key, ttl, orjson.dumps(value, default=str))
+            except Exception as e:
+                print(f"Redis cache write failed: {str(e)}")
+
     def _generate_session_id(self) -> str:
         """Generate a unique session ID"""
-        timestamp = str(time.time())
-        random_str = str(random.randint(1000000, 9999999))
-        return hashlib.md5(f"{timestamp}{random_str}".encode()).hexdigest()
+        # 128 random bits straight from the OS - no MD5 round-trip
+        return secrets.token_hex(16)
     
     def _create_client(self) -> httpx.Client:
         """Create HTTP client with appropriate headers"""
@@ -68,7 +186,16 @@ class InstagramScraper:
         client_config = {
             "headers": headers,
             "timeout": 30.0,
-            "follow_redirects": True
+            "follow_redirects": True,
+            # Keep-alive pool so profile + image subrequests reuse
+            # connections instead of paying TCP+TLS handshakes each
+            # time. The limits must live on the transport: when an
+            # explicit transport is passed, httpx ignores a separate
+            # limits= argument.
+            "transport": httpx.HTTPTransport(
+                retries=3,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+            )
         }
         
         if self.use_proxy:
@@ -78,9 +205,24 @@ class InstagramScraper:
         return httpx.Client(**client_config)
     
     def _add_delay(self):
-        """Add random delay to avoid detection"""
-        delay = random.uniform(2, 5)
-        time.sleep(delay)
+        """Pace requests to Instagram, sleeping only the remaining gap
+
+        The gap is still randomized to avoid detection, but it is
+        measured from the last network request rather than slept
+        unconditionally: the first request and any request arriving
+        after the gap has already passed (cache hits in between, time
+        spent parsing) proceed immediately.
+        """
+        # Sleep while holding the lock: concurrent workers queue up
+        # behind it and each departs one gap after the previous one,
+        # instead of all reading the same stale timestamp and firing
+        # their requests simultaneously
+        with self._req_pace_lock:
+            gap = random.uniform(2, 5)
+            wait = self._last_req_time + gap - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_req_time = time.monotonic()
     
     def get_profile_data(self, username: str) -> Optional[Dict]:
         """
@@ -93,10 +235,11 @@ class InstagramScraper:
             Dictionary containing profile data or None if failed
         """
         # Check cache first
-        cache_key = f"profile_{username}"
-        if cache_key in self.cache:
+        cache_key = f"ig:profile:v2:{username}"
+        cached = self._cache_get(cache_key)
+        if cached:
             print(f"Using cached data for {username}")
-            return self.cache[cache_key]
+            return cached
         
         print(f"Fetching profile data for @{username}...")
         self._add_delay()
@@ -105,39 +248,47 @@ class InstagramScraper:
             # Try the web profile info endpoint
             url = f"https://www.instagram.com/api/v1/users/web_profile_info/?username={username}"
             
-            # Update referer for this specific request
-            self.client.headers.update({
+            # Per-request headers (httpx merges them with the client's)
+            # rather than mutating the shared header dict - safe under
+            # concurrent use, and the user agent actually rotates
+            req_headers = {
                 "Referer": f"https://www.instagram.com/{username}/",
-                "X-Instagram-AJAX": "1"
-            })
-            
-            response = self.client.get(url)
+                "X-Instagram-AJAX": "1",
+                "User-Agent": next(self._ua_cycle)
+            }
+
+            response = self.client.get(url, headers=req_headers)
             
             if response.status_code == 200:
-                data = response.json()
+                # Parse the raw bytes with orjson: ~3x faster than the
+                # stdlib parser httpx uses, and these payloads run to
+                # a few hundred KB
+                data = orjson.loads(response.content)
                 
                 if "data" in data and "user" in data["data"]:
                     user_data = data["data"]["user"]
-                    
+                    posts, avg_likes = self._extract_posts(user_data)
+
                     # Extract relevant information
                     profile_info = {
                         "username": user_data.get("username", username),
                         "full_name": user_data.get("full_name", ""),
                         "biography": user_data.get("biography", ""),
                         "profile_pic_url": user_data.get("profile_pic_url_hd", user_data.get("profile_pic_url", "")),
-                        "follower_count": user_data.get("edge_followed_by", {}).get("count", 0),
-                        "following_count": user_data.get("edge_follow", {}).get("count", 0),
-                        "post_count": user_data.get("edge_owner_to_timeline_media", {}).get("count", 0),
+                        "follower_count": (user_data.get("edge_followed_by") or {}).get("count", 0),
+                        "following_count": (user_data.get("edge_follow") or {}).get("count", 0),
+                        "post_count": (user_data.get("edge_owner_to_timeline_media") or {}).get("count", 0),
                         "is_business": user_data.get("is_business_account", False),
                         "is_verified": user_data.get("is_verified", False),
                         "category": user_data.get("category_name", ""),
                         "external_url": user_data.get("external_url", ""),
-                        "posts": self._extract_posts(user_data),
+                        "posts": posts,
+                        "avg_likes": avg_likes,
                         "scraped_at": datetime.now().isoformat()
                     }
                     
                     # Cache the result
-                    self.cache[cache_key] = profile_info
+                    self._cache_set(cache_key, profile_info)
                     
                     print(f"Successfully scraped profile for @{username}")
                     return profile_info
@@ -153,135 +304,221 @@ class InstagramScraper:
             print(f"Error fetching profile: {str(e)}")
             return None
     
-    def _extract_posts(self, user_data: Dict) -> List[Dict]:
-        """Extract posts from user data"""
+    def _extract_posts(self, user_data: Dict) -> Tuple[List[Dict], int]:
+        """Extract posts and their average like count from user data
+
+        The average is accumulated during the parse so consumers don't
+        re-walk the post list (and don't have to guard the empty case).
+        """
         posts = []
-        
+        total_likes = 0
+
         try:
-            media_data = user_data.get("edge_owner_to_timeline_media", {})
-            edges = media_data.get("edges", [])
+            # "or {}" instead of a literal default: get(k, {}) builds
+            # the empty dict on every call even when the key is present
+            media_data = user_data.get("edge_owner_to_timeline_media") or {}
+            edges = media_data.get("edges") or []
             
             for edge in edges[:12]:  # Get up to 12 recent posts
-                node = edge.get("node", {})
-                
+                # Bind the nested dicts once per post ("or {}" also
+                # covers the API returning null) and extract the
+                # caption a single time instead of twice
+                node = edge.get("node") or {}
+                caption = self._extract_caption(node)
+                display_url = node.get("display_url", "")
+                liked = node.get("edge_liked_by") or {}
+                commented = node.get("edge_media_to_comment") or {}
+                likes = liked.get("count", 0)
+                total_likes += likes
+
                 post = {
                     "id": node.get("id", ""),
                     "shortcode": node.get("shortcode", ""),
-                    "caption": self._extract_caption(node),
-                    "image_url": node.get("display_url", ""),
-                    "thumbnail_url": node.get("thumbnail_src", node.get("display_url", "")),
+                    "caption": caption,
+                    "image_url": display_url,
+                    "thumbnail_url": node.get("thumbnail_src", display_url),
                     "is_video": node.get("is_video", False),
-                    "likes": node.get("edge_liked_by", {}).get("count", 0),
-                    "comments": node.get("edge_media_to_comment", {}).get("count", 0),
+                    "likes": likes,
+                    "comments": commented.get("count", 0),
                     "timestamp": node.get("taken_at_timestamp", 0),
-                    "hashtags": self._extract_hashtags(self._extract_caption(node))
+                    "hashtags": self._extract_hashtags(caption)
                 }
-                
+
                 posts.append(post)
                 
         except Exception as e:
             print(f"Error extracting posts: {str(e)}")
-            
-        return posts
+
+        return posts, (total_likes // len(posts) if posts else 0)
     
     def _extract_caption(self, node: Dict) -> str:
         """Extract caption text from post node"""
         try:
-            edges = node.get("edge_media_to_caption", {}).get("edges", [])
+            edges = (node.get("edge_media_to_caption") or {}).get("edges") or []
             if edges:
-                return edges[0].get("node", {}).get("text", "")
+                return (edges[0].get("node") or {}).get("text", "")
         except:
             pass
         return ""
     
-    def _extract_hashtags(self, text: str) -> List[str]:
+    def _extract_hashtags(self, text: str) -> Tuple[str, ...]:
         """Extract hashtags from text"""
-        hashtags = re.findall(r'#(\w+)', text)
-        return hashtags
+        # Tuple: never mutated downstream, and smaller than a list
+        return tuple(_HASHTAG_RE.findall(text))
     
     def extract_brand_colors(self, profile_data: Dict) -> List[Tuple[int, int, int]]:
         """
         Extract dominant colors from profile images
-        
+
         Args:
             profile_data: Profile data dictionary
-            
+
         Returns:
             List of RGB color tuples
         """
+        return asyncio.run(self.extract_brand_colors_async(profile_data))
+
+    async def extract_brand_colors_async(self, profile_data: Dict) -> List[Tuple[int, int, int]]:
+        """Async variant: downloads all candidate images concurrently"""
         print("Extracting brand colors from images...")
         colors = []
-        
-        # Get profile picture
-        if profile_data.get("profile_pic_url"):
-            profile_colors = self._get_image_colors(profile_data["profile_pic_url"])
-            colors.extend(profile_colors[:2])  # Get top 2 colors from profile pic
-        
-        # Get colors from recent posts
-        posts = profile_data.get("posts", [])
-        for post in posts[:3]:  # Analyze first 3 posts
-            if post.get("image_url"):
-                post_colors = self._get_image_colors(post["image_url"])
-                if post_colors:
-                    colors.append(post_colors[0])  # Get dominant color from each
-        
+
+        profile_pic_url = profile_data.get("profile_pic_url")
+        post_urls = [
+            post["image_url"]
+            for post in profile_data.get("posts", [])[:3]  # Analyze first 3 posts
+            if post.get("image_url")
+        ]
+        urls = ([profile_pic_url] if profile_pic_url else []) + post_urls
+
+        if urls:
+            # One gather over profile pic + posts: wall time is the
+            # slowest download rather than the sum of all four
+            async with httpx.AsyncClient(
+                timeout=10.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+                headers={"User-Agent": random.choice(self.user_agents)}
+            ) as client:
+                results = await asyncio.gather(
+                    *(self._get_image_colors(client, url) for url in urls),
+                    return_exceptions=True
+                )
+        else:
+            results = []
+
+        idx = 0
+        if profile_pic_url:
+            profile_colors = results[0]
+            if not isinstance(profile_colors, Exception):
+                colors.extend(profile_colors[:2])  # Get top 2 colors from profile pic
+            idx = 1
+
+        for post_colors in results[idx:]:
+            if not isinstance(post_colors, Exception) and post_colors:
+                colors.append(post_colors[0])  # Get dominant color from each
+
         # Remove duplicates and return top colors
-        unique_colors = []
-        for color in colors:
-            if color and not any(self._colors_similar(color, c) for c in unique_colors):
-                unique_colors.append(color)
-        
+        unique_colors = self._dedup_colors(colors)
+
         return unique_colors[:5]  # Return top 5 unique colors
-    
-    def _get_image_colors(self, image_url: str) -> List[Tuple[int, int, int]]:
+
+    def _dedup_colors(self, colors: List[Tuple[int, int, int]],
+                      threshold: int = 50) -> List[Tuple[int, int, int]]:
+        """Greedily drop colors too similar to an already-kept one
+
+        Computes the pairwise Manhattan distances in one NumPy
+        broadcast instead of calling _colors_similar per pair.
+        """
+        colors = [color for color in colors if color]
+        if not colors:
+            return []
+
+        c = np.asarray(colors, dtype=np.int16)
+        dists = np.abs(c[:, None, :] - c[None, :, :]).sum(-1)
+
+        kept = [0]
+        for i in range(1, len(colors)):
+            if dists[i, kept].min() >= threshold:
+                kept.append(i)
+
+        return [colors[i] for i in kept]
+
+    async def _get_image_colors(self, client: httpx.AsyncClient,
+                                image_url: str) -> List[Tuple[int, int, int]]:
         """Get dominant colors from an image URL"""
+        # CDN URLs are stable for hours, so a hit skips both the
+        # download and the decode - the whole cost of this method
+        cache_key = (
+            "ig:imgcolors:"
+            + hashlib.blake2b(image_url.encode(), digest_size=16).hexdigest()
+        )
+        cached = self._cache_get(cache_key)
+        if cached:
+            return [tuple(color) for color in cached]
+
         try:
             # Download image
-            response = requests.get(image_url, timeout=10)
+            response = await client.get(image_url)
             img = Image.open(BytesIO(response.content))
-            
+
+            # JPEG fast path: ask libjpeg to decode at reduced DCT
+            # scale since we only need a thumbnail anyway. No-op for
+            # other formats
+            img.draft('RGB', (300, 300))
+            img.load()
+
             # Convert to RGB if necessary
             if img.mode != 'RGB':
                 img = img.convert('RGB')
+
+            # Resize for faster processing; bilinear is plenty for
+            # palette work and cheaper than the default Lanczos
+            img.thumbnail((150, 150), Image.Resampling.BILINEAR)
             
-            # Resize for faster processing
-            img.thumbnail((150, 150))
-            
-            # Get all pixels
-            pixels = list(img.getdata())
-            
-            # Filter out white, black, and gray colors
-            filtered_pixels = []
-            for pixel in pixels:
-                r, g, b = pixel
-                # Skip if too close to white, black, or gray
-                if not (
+            # Median-cut quantize in C, then inspect the 16-entry
+            # palette instead of 22k raw pixels; the quantizer merges
+            # perceptually-close shades for us
+            palette = img.quantize(colors=16, method=Image.Quantize.MEDIANCUT)
+            counts = sorted(palette.convert('RGB').getcolors(), reverse=True)
+
+            # Filter out white, black, and gray palette entries
+            dominant_colors = []
+            unfiltered = []
+            for count, (r, g, b) in counts:
+                unfiltered.append((r, g, b))
+                if (
                     (r > 240 and g > 240 and b > 240) or  # Nearly white
                     (r < 30 and g < 30 and b < 30) or      # Nearly black
                     (abs(r - g) < 20 and abs(g - b) < 20 and abs(r - b) < 20)  # Gray
                 ):
-                    filtered_pixels.append(pixel)
-            
-            if not filtered_pixels:
-                filtered_pixels = pixels
-            
-            # Get most common colors
-            color_counter = Counter(filtered_pixels)
-            dominant_colors = [color for color, count in color_counter.most_common(5)]
-            
+                    continue
+                dominant_colors.append((r, g, b))
+                if len(dominant_colors) == 5:
+                    break
+
+            if not dominant_colors:
+                dominant_colors = unfiltered[:5]
+
+            self._cache_set(cache_key, dominant_colors, ttl=86400)
+
             return dominant_colors
             
         except Exception as e:
             print(f"Error extracting colors from image: {str(e)}")
             return []
     
-    def _colors_similar(self, color1: Tuple[int, int, int], color2: Tuple[int, int, int], threshold: int = 50) -> bool:
-        """Check if two colors are similar"""
-        if not color1 or not color2:
-            return False
-        r1, g1, b1 = color1
-        r2, g2, b2 = color2
-        return abs(r1 - r2) + abs(g1 - g2) + abs(b1 - b2) < threshold
+    @staticmethod
+    def _colors_similar(color1: Tuple[int, int, int], color2: Tuple[int, int, int],
+                        threshold: int = 50) -> bool:
+        """Check if two colors are similar (L1 distance below threshold)"""
+        # Single expression, no unpacking: bulk comparisons go through
+        # the vectorized _dedup_colors; this is the one-off pair check
+        return bool(color1) and bool(color2) and (
+            abs(color1[0] - color2[0])
+            + abs(color1[1] - color2[1])
+            + abs(color1[2] - color2[2])
+        ) < threshold
     
     def extract_business_info(self, profile_data: Dict) -> Dict:
         """
@@ -294,79 +531,52 @@ class InstagramScraper:
             Dictionary with business information
         """
         print("Extracting business information...")
-        
+
+        # Normalize the scanned text once up front; each helper then
+        # works on a prepared buffer instead of re-pulling and
+        # re-lowercasing the same bio and captions
+        bio = profile_data.get("biography") or ""
+        bio_lower = bio.lower()
+        parts = [bio_lower]
+        for post in profile_data.get("posts", []):
+            caption = post.get("caption") or ""
+            parts.append(caption.lower())
+        all_text = " ".join(parts)
+
         business_info = {
-            "business_type": self._detect_business_type(profile_data),
-            "services": self._extract_services(profile_data),
-            "contact_info": self._extract_contact_info(profile_data),
-            "location": self._extract_location(profile_data),
+            "business_type": self._detect_business_type(profile_data, all_text),
+            "services": self._extract_services(bio),
+            "contact_info": self._extract_contact_info(profile_data, bio),
+            "location": self._extract_location(bio),
             "keywords": self._extract_keywords(profile_data),
-            "tone": self._detect_brand_tone(profile_data)
+            "tone": self._detect_brand_tone(bio_lower)
         }
-        
+
         return business_info
     
-    def _detect_business_type(self, profile_data: Dict) -> str:
-        """Detect the type of business from profile and posts"""
-        category = profile_data.get("category", "")
-        if category is None:
-            category = ""
-        category = category.lower()
-        bio = profile_data.get("biography", "")
-        if bio is None:
-            bio = ""
-        bio = bio.lower()
-        
-        # Check posts for keywords
-        all_text = bio
-        for post in profile_data.get("posts", []):
-            caption = post.get("caption", "")
-            if caption is None:
-                caption = ""
-            all_text += " " + caption.lower()
-        
-        # Business type patterns
-        patterns = {
-            "restaurant": ["food", "menu", "restaurant", "cafe", "dining", "chef", "cuisine"],
-            "fashion": ["fashion", "style", "clothing", "boutique", "wear", "outfit", "collection"],
-            "beauty": ["beauty", "salon", "makeup", "hair", "skincare", "spa", "cosmetics"],
-            "fitness": ["fitness", "gym", "workout", "training", "yoga", "health", "wellness"],
-            "photography": ["photography", "photographer", "photo", "shoot", "camera", "portrait"],
-            "real_estate": ["real estate", "property", "realtor", "homes", "listing", "rent"],
-            "consulting": ["consulting", "consultant", "advisor", "strategy", "business", "coach"],
-            "art": ["art", "artist", "gallery", "painting", "design", "creative", "illustration"],
-            "education": ["education", "course", "training", "learn", "workshop", "tutorial"],
-            "tech": ["tech", "software", "app", "digital", "development", "coding", "startup"]
-        }
-        
-        scores = {}
-        for biz_type, keywords in patterns.items():
-            score = sum(1 for keyword in keywords if keyword in all_text)
-            if score > 0:
-                scores[biz_type] = score
-        
+    def _detect_business_type(self, profile_data: Dict, all_text: str) -> str:
+        """Detect the type of business from bio and captions"""
+        category = (profile_data.get("category") or "").lower()
+
+        # Single pass over the combined text; each keyword found scores
+        # a point for every business type listing it
+        scores = Counter()
+        for keyword in set(_BIZ_SCAN_RE.findall(all_text)):
+            for biz_type in _BIZ_KEYWORD_LABELS[keyword]:
+                scores[biz_type] += 1
+
         if scores:
             return max(scores, key=scores.get)
-        
+
         return category if category else "general"
     
-    def _extract_services(self, profile_data: Dict) -> List[str]:
-        """Extract services offered from bio and posts"""
+    def _extract_services(self, bio: str) -> List[str]:
+        """Extract services offered from the bio"""
         services = []
-        
-        bio = profile_data.get("biography", "")
-        
+
         # Look for service indicators
-        service_patterns = [
-            r'(?:we offer|offering|services|specializing in)[:\s]+([^.\n]+)',
-            r'✓\s*([^✓\n]+)',
-            r'•\s*([^•\n]+)',
-            r'[-]\s*([^-\n]+)',
-            r'\d+\.\s*([^.\n]+)'
-        ]
-        
-        for pattern in service_patterns:
-            matches = re.findall(pattern, bio, re.IGNORECASE)
+        for pattern in _SERVICE_RES:
+            matches = pattern.findall(bio)
             services.extend([match.strip() for match in matches])
         
         # Clean up services
@@ -374,24 +584,22 @@ class InstagramScraper:
         
         return services[:10]  # Return top 10 services
     
-    def _extract_contact_info(self, profile_data: Dict) -> Dict:
+    def _extract_contact_info(self, profile_data: Dict, bio: str) -> Dict:
         """Extract contact information"""
         contact = {}
-        
-        bio = profile_data.get("biography", "")
-        
+
         # Email pattern
-        email_match = re.search(r'[\w._%+-]+@[\w.-]+\.[A-Z|a-z]{2,}', bio)
+        email_match = _EMAIL_RE.search(bio)
         if email_match:
             contact["email"] = email_match.group()
-        
+
         # Phone pattern
-        phone_match = re.search(r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,5}[-\s\.]?[0-9]{1,5}', bio)
+        phone_match = _PHONE_RE.search(bio)
         if phone_match:
             contact["phone"] = phone_match.group()
-        
+
         # WhatsApp pattern
-        whatsapp_match = re.search(r'whatsapp[:\s]+([+0-9\s-]+)', bio, re.IGNORECASE)
+        whatsapp_match = _WHATSAPP_RE.search(bio)
         if whatsapp_match:
             contact["whatsapp"] = whatsapp_match.group(1).strip()
         
@@ -401,19 +609,11 @@ class InstagramScraper:
         
         return contact
     
-    def _extract_location(self, profile_data: Dict) -> str:
+    def _extract_location(self, bio: str) -> str:
         """Extract location information"""
-        bio = profile_data.get("biography", "")
-        
         # Look for location indicators
-        location_patterns = [
-            r'📍\s*([^\n]+)',
-            r'(?:located in|based in|from)\s+([^\n,.]+)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),?\s*(?:[A-Z]{2}|[A-Z][a-z]+)'
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, bio, re.IGNORECASE)
+        for pattern in _LOCATION_RES:
+            match = pattern.search(bio)
             if match:
                 return match.group(1).strip()
         
@@ -421,41 +621,25 @@ class InstagramScraper:
     
     def _extract_keywords(self, profile_data: Dict) -> List[str]:
         """Extract relevant keywords from profile"""
-        keywords = []
-        
-        # Get all hashtags
+        # Count hashtags straight into the Counter - no intermediate
+        # flattened list, each tag hashed once
+        keyword_counts = Counter()
         for post in profile_data.get("posts", []):
-            keywords.extend(post.get("hashtags", []))
-        
-        # Get unique keywords
-        keyword_counts = Counter(keywords)
-        
+            keyword_counts.update(post.get("hashtags") or ())
+
         # Return top keywords
         return [keyword for keyword, count in keyword_counts.most_common(20)]
     
-    def _detect_brand_tone(self, profile_data: Dict) -> List[str]:
-        """Detect brand tone from content"""
-        bio = profile_data.get("biography", "")
-        if bio is None:
-            bio = ""
-        bio = bio.lower()
-        
-        tone_indicators = {
-            "professional": ["professional", "expert", "certified", "licensed", "qualified"],
-            "friendly": ["friendly", "welcome", "happy", "love", "❤️", "😊"],
-            "luxury": ["luxury", "premium", "exclusive", "vip", "elite"],
-            "casual": ["casual", "fun", "chill", "relax", "easy"],
-            "modern": ["modern", "innovative", "cutting-edge", "latest", "new"],
-            "traditional": ["traditional", "classic", "authentic", "original", "established"],
-            "minimal": ["minimal", "simple", "clean", "pure", "essential"],
-            "bold": ["bold", "vibrant", "dynamic", "powerful", "strong"]
-        }
-        
-        detected_tones = []
-        for tone, indicators in tone_indicators.items():
-            if any(indicator in bio for indicator in indicators):
-                detected_tones.append(tone)
-        
+    def _detect_brand_tone(self, bio: str) -> List[str]:
+        """Detect brand tone from the (lowercased) bio"""
+        # One scan of the bio, then map the hits back to their tones
+        detected = set()
+        for keyword in _TONE_SCAN_RE.findall(bio):
+            detected.update(_TONE_KEYWORD_LABELS[keyword])
+
+        # Preserve the dict's ordering for the "top" tones
+        detected_tones = [tone for tone in _TONE_INDICATORS if tone in detected]
+
         return detected_tones[:3]  # Return top 3 tones
     
     def get_full_profile_analysis(self, username: str) -> Optional[Dict]:
@@ -468,25 +652,65 @@ class InstagramScraper:
         Returns:
             Complete profile analysis or None if failed
         """
-        # Get basic profile data
-        profile_data = self.get_profile_data(username)
-        
+        return asyncio.run(self.get_full_profile_analysis_async(username))
+
+    async def get_full_profile_analysis_async(self, username: str) -> Optional[Dict]:
+        """Async variant of get_full_profile_analysis"""
+        # A hit here skips color extraction and business analysis too,
+        # not just the profile fetch
+        cache_key = f"ig:analysis:v2:{username}"
+        cached = self._cache_get(cache_key)
+        if cached:
+            print(f"Using cached analysis for {username}")
+            return cached
+
+        # Get basic profile data; the fetch (and its anti-detection
+        # delay) uses the blocking client, so run it on a worker thread
+        profile_data = await asyncio.to_thread(self.get_profile_data, username)
+
         if not profile_data:
             return None
-        
+
         # Extract additional information
-        brand_colors = self.extract_brand_colors(profile_data)
+        brand_colors = await self.extract_brand_colors_async(profile_data)
         business_info = self.extract_business_info(profile_data)
-        
+
         # Combine everything
         full_analysis = {
             **profile_data,
             "brand_colors": [{"r": c[0], "g": c[1], "b": c[2]} for c in brand_colors if c],
             "business_info": business_info
         }
-        
+
+        self._cache_set(cache_key, full_analysis)
+
         return full_analysis
 
+    async def get_many_profile_analyses(self, usernames: List[str],
+                                        concurrency: int = 5) -> List[Optional[Dict]]:
+        """
+        Analyze several profiles concurrently
+
+        Args:
+            usernames: Instagram usernames (without @)
+            concurrency: Maximum profiles in flight at once - keep it
+                modest so Instagram rate limits don't kick in
+
+        Returns:
+            One result per username, in order; an Exception instance
+            takes the place of any analysis that failed
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def analyze(username):
+            async with semaphore:
+                return await self.get_full_profile_analysis_async(username)
+
+        return await asyncio.gather(
+            *(analyze(username) for username in usernames),
+            return_exceptions=True
+        )
+
 
 def main():
     """Main function for testing the scraper"""
@@ -528,8 +752,8 @@ def main():
             
             # Save to JSON file
             filename = f"{test_username}_profile.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
             print(f"\n✓ Full analysis saved to {filename}")
         else:
             print("Failed to analyze profile. Please check the username and try again.")
@@ -7,72 +7,286 @@ Automates website generation using Playwright browser automation
 import asyncio
 import os
 import json
+import re
 import time
+from dataclasses import dataclass
 from typing import Dict, Optional, Tuple
 from datetime import datetime
 from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import logging
 
+try:
+    # libuv-backed event loop: every CDP message crosses the loop, so
+    # the faster backend directly cuts the per-message overhead.
+    # Optional - absent on Windows or minimal installs.
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compiled once: runs on every tick of the preview polling loop
+_PROJECT_ID_RE = re.compile(r'project/([a-zA-Z0-9\-]+)')
+
+@dataclass(frozen=True)
+class Credentials:
+    """Lovable account credentials, resolved once and passed through"""
+    email: str = ''
+    password: str = ''
+
+    @classmethod
+    def from_env(cls) -> 'Credentials':
+        return cls(os.getenv('LOVABLE_EMAIL', ''), os.getenv('LOVABLE_PASSWORD', ''))
+
+    def __bool__(self) -> bool:
+        return bool(self.email and self.password)
+
+
+# Saved cookies/localStorage from a successful login; contexts seeded
+# from it skip the whole credential flow on later runs
+_STORAGE_STATE_PATH = '.lovable_state.json'
+_STORAGE_STATE_MAX_AGE = 24 * 3600  # seconds; sessions older than a day are stale
+
+# Shared Chromium launch flags: strip background work (GPU compositing,
+# extensions, tab throttling, renderer backgrounding, origin isolation)
+# that costs startup time and memory without helping headless automation
+_BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-features=TranslateUI,IsolateOrigins,site-per-process',
+]
+
+# Resource types aborted by the request filter: the automation only
+# reads DOM structure and attributes, never rendered pixels or glyphs
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+# Hosts whose requests always go through - the app itself plus the
+# preview domains wait_for_preview_url watches for
+_ALLOWED_HOSTS = ('lovable.dev', 'lovableproject', 'vercel', 'netlify')
+
+# Selector registry keyed by intent. 'fast' holds cheap attribute/CSS
+# selectors the engine can match without walking text content; each is
+# tried with a short timeout before falling back to the broad
+# :has-text unions, which stay as the safety net for UI changes.
+LOVABLE_SELECTORS = {
+    'new_project': {
+        'fast': '[data-testid="new-project-button"], button[aria-label*="new project" i]',
+        'fallback': 'button:has-text("New Project"), button:has-text("New"), button:has-text("Create")',
+    },
+    'sign_in': {
+        'fast': '[data-testid="sign-in-button"], a[href*="login"], a[href*="signin"]',
+        'fallback': 'button:has-text("Sign in"), button:has-text("Sign In"), '
+                    'button:has-text("Login"), a:has-text("Sign in")',
+    },
+    'prompt_input': {
+        'fast': '[data-testid="prompt-input"], textarea[placeholder*="describe" i]',
+        'fallback': 'textarea, [contenteditable="true"], input[type="text"][placeholder*="describe" i]',
+    },
+    'generate': {
+        'fast': '[data-testid="generate-button"], button[type="submit"]',
+        'fallback': 'button:has-text("Generate"), button:has-text("Create"), '
+                    'button:has-text("Build"), button[type="submit"]',
+    },
+}
+
+# Installed once per wait: pushes the preview URL to Python the instant
+# a matching iframe/link appears, instead of Python polling for it. The
+# observer disconnects itself after firing.
+_PREVIEW_OBSERVER_JS = """
+() => {
+    const find = () => document.querySelector(
+        'iframe[src*="lovableproject"], iframe[src*="vercel"], iframe[src*="netlify"], '
+        + 'a[href*="lovableproject"], a[href*="vercel"], a[href*="netlify"]');
+    const report = (el) => window.onPreviewFound(el.src || el.href || '');
+    const existing = find();
+    if (existing) { report(existing); return; }
+    new MutationObserver((muts, obs) => {
+        const el = find();
+        if (el) { obs.disconnect(); report(el); }
+    }).observe(document.body, {
+        subtree: true, childList: true,
+        attributes: true, attributeFilter: ['src', 'href']
+    });
+}
+"""
+
+# One probe round-trip for every fallback detection method: candidate
+# iframe src, candidate link href, a URL in the page text, and the
+# current location, returned together instead of via separate CDP calls
+_PREVIEW_PROBE_JS = """
+() => {
+    const ifr = document.querySelector(
+        'iframe[src*="lovableproject"], iframe[src*="vercel"], iframe[src*="netlify"]');
+    const lnk = document.querySelector(
+        'a[href*="lovableproject"], a[href*="vercel"], a[href*="netlify"]');
+    const m = document.body.innerText.match(
+        /https:\\/\\/[\\w\\-]+\\.(lovableproject|vercel|netlify)\\.\\w+/);
+    return {
+        iframe: ifr ? ifr.src : null,
+        link: lnk ? lnk.href : null,
+        text: m ? m[0] : null,
+        url: location.href
+    };
+}
+"""
+
+# Single DOM probe for the login flow: one evaluate round-trip reports
+# every control the flow branches on, instead of a separate
+# locator.count() protocol round-trip per element
+_LOGIN_STATE_JS = """
+() => {
+    const hasText = (selector, needles) =>
+        [...document.querySelectorAll(selector)].some((el) =>
+            needles.some((t) => (el.textContent || '').toLowerCase().includes(t)));
+    return {
+        newProject: hasText('button', ['new project']),
+        signIn: hasText('button, a', ['sign in', 'login']),
+        emailInput: !!document.querySelector(
+            'input[type="email"], input[name="email"], input[placeholder*="email" i]'),
+        passwordInput: !!document.querySelector(
+            'input[type="password"], input[name="password"]'),
+        submitButton: !!document.querySelector('button[type="submit"]')
+            || hasText('button', ['sign in', 'login'])
+    };
+}
+"""
+
 
 class LovableAutomator:
     """Automates Lovable.dev website generation"""
     
-    def __init__(self, email: str = None, password: str = None, headless: bool = False):
+    def __init__(self, email: str = None, password: str = None, headless: bool = False,
+                 browser: Browser = None, creds: Credentials = None):
         """
         Initialize Lovable automator
-        
+
         Args:
             email: Lovable account email
             password: Lovable account password
             headless: Run browser in headless mode
+            browser: Already-launched browser to reuse; the automator
+                then only creates (and tears down) its own context
+            creds: Resolved credentials; takes precedence over
+                email/password and skips the env lookups
         """
-        self.email = email or os.getenv('LOVABLE_EMAIL', '')
-        self.password = password or os.getenv('LOVABLE_PASSWORD', '')
+        if creds is None:
+            creds = Credentials(email, password) if email or password \
+                else Credentials.from_env()
+        self.creds = creds
         self.headless = headless
-        self.browser = None
+        self.browser = browser
+        self._owns_browser = browser is None
+        self._playwright = None
         self.page = None
         self.context = None
-        
+        self._preview_found = None
+        self._preview_binding_installed = False
+
     async def initialize_browser(self):
         """Initialize Playwright browser"""
         logger.info("Initializing browser...")
-        playwright = await async_playwright().start()
-        
-        # Launch browser with specific settings
-        self.browser = await playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox'
-            ]
-        )
-        
-        # Create context with viewport and user agent
-        self.context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
-        
+
+        # Launch only when no shared browser was handed in - launching
+        # Chromium costs seconds, contexts are nearly free
+        if self.browser is None:
+            self._playwright = await async_playwright().start()
+            self.browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=_BROWSER_ARGS
+            )
+
+        # Create context with viewport and user agent; reduced motion
+        # stops CSS transitions from delaying element actionability
+        context_kwargs = {
+            'viewport': {'width': 1920, 'height': 1080},
+            'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'reduced_motion': 'reduce',
+        }
+
+        # Seed the context with a saved login session when one is fresh
+        # enough - the "Already logged in" probe then short-circuits the
+        # whole credential flow
+        state = self._fresh_storage_state()
+        if state:
+            context_kwargs['storage_state'] = state
+            logger.info("Reusing saved login session")
+
+        self.context = await self.browser.new_context(**context_kwargs)
+
         # Create page
         self.page = await self.context.new_page()
+
+        # Drop heavy third-party resources before they hit the network;
+        # screenshots lose styling, but generation doesn't need it
+        await self.page.route('**/*', self._filter_request)
         logger.info("Browser initialized successfully")
-        
+
+    @staticmethod
+    def _fresh_storage_state() -> Optional[str]:
+        """Path to the saved login session, or None if absent/stale"""
+        try:
+            if time.time() - os.path.getmtime(_STORAGE_STATE_PATH) < _STORAGE_STATE_MAX_AGE:
+                return _STORAGE_STATE_PATH
+        except OSError:
+            pass
+        return None
+
+    async def _save_login_state(self):
+        """Persist cookies/localStorage so later runs skip the login flow"""
+        try:
+            await self.context.storage_state(path=_STORAGE_STATE_PATH)
+        except Exception as e:
+            logger.debug(f"Could not save login state: {str(e)}")
+
+    @staticmethod
+    async def _filter_request(route, request):
+        """Abort image/media/font/stylesheet loads from non-Lovable hosts"""
+        if (request.resource_type in _BLOCKED_RESOURCE_TYPES
+                and not any(host in request.url for host in _ALLOWED_HOSTS)):
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def close_browser(self):
-        """Close browser and cleanup"""
-        if self.page:
-            await self.page.close()
-        if self.context:
-            await self.context.close()
-        if self.browser:
+        """Close this automator's page/context (and browser if owned)"""
+        # Page and context closes are independent CDP calls; overlap
+        # them instead of paying two serial round-trips
+        closers = [target.close() for target in (self.page, self.context) if target]
+        if closers:
+            await asyncio.gather(*closers, return_exceptions=True)
+        # The browser must go last - page/context live inside it
+        if self.browser and self._owns_browser:
             await self.browser.close()
+            if self._playwright:
+                await self._playwright.stop()
         logger.info("Browser closed")
-    
+
+    async def _locate(self, intent: str):
+        """
+        Return a locator for an intent from LOVABLE_SELECTORS
+
+        Tries the stable fast-path selector with a short timeout, then
+        falls back to the broad text-matching union.
+        """
+        selectors = LOVABLE_SELECTORS[intent]
+        try:
+            await self.page.wait_for_selector(
+                selectors['fast'], state='attached', timeout=500
+            )
+            return self.page.locator(selectors['fast'])
+        except PlaywrightTimeoutError:
+            return self.page.locator(selectors['fallback'])
+
     async def login_to_lovable(self) -> bool:
         """
         Login to Lovable.dev
@@ -82,48 +296,80 @@ class LovableAutomator:
         """
         try:
             logger.info("Navigating to Lovable.dev...")
-            await self.page.goto('https://lovable.dev', wait_until='networkidle')
-            
-            # Wait a bit for page to fully load
-            await self.page.wait_for_timeout(2000)
+            await self.page.goto('https://lovable.dev', wait_until='domcontentloaded')
+
+            # Wait for the first actionable element rather than network
+            # idle - SPAs keep analytics beacons running long after the
+            # page is usable
+            try:
+                await self.page.wait_for_selector(
+                    'button:has-text("New Project"), input[type="email"], '
+                    'button:has-text("Sign in"), a:has-text("Sign in")',
+                    timeout=15000
+                )
+            except PlaywrightTimeoutError:
+                pass  # the probes below report what's actually missing
             
+            # Probe the whole page state in one round-trip
+            state = await self.page.evaluate(_LOGIN_STATE_JS)
+
             # Check if already logged in
-            if await self.page.locator('button:has-text("New Project")').count() > 0:
+            if state['newProject']:
                 logger.info("Already logged in")
+                await self._save_login_state()  # refresh the saved session's age
                 return True
-            
+
             # Look for sign in button
-            sign_in_button = self.page.locator('button:has-text("Sign in"), button:has-text("Sign In"), button:has-text("Login"), a:has-text("Sign in")')
-            
-            if await sign_in_button.count() > 0:
+            if state['signIn']:
                 logger.info("Found sign in button, clicking...")
+                sign_in_button = await self._locate('sign_in')
                 await sign_in_button.first.click()
-                await self.page.wait_for_timeout(2000)
-            
+                # Wait for the login form itself, not a fixed delay
+                try:
+                    await self.page.wait_for_selector('input[type="email"]', timeout=10000)
+                except PlaywrightTimeoutError:
+                    pass  # OAuth-only flows may never show an email field
+                # Re-probe: the click usually reveals the login form
+                state = await self.page.evaluate(_LOGIN_STATE_JS)
+
             # Check for email input
-            email_input = self.page.locator('input[type="email"], input[name="email"], input[placeholder*="email" i]')
-            if await email_input.count() > 0:
+            if state['emailInput']:
                 logger.info("Entering email...")
-                await email_input.fill(self.email)
-                
+                email_input = self.page.locator(
+                    'input[type="email"], input[name="email"], input[placeholder*="email" i]'
+                )
+                await email_input.fill(self.creds.email)
+
                 # Look for password input
-                password_input = self.page.locator('input[type="password"], input[name="password"]')
-                if await password_input.count() > 0:
+                if state['passwordInput']:
                     logger.info("Entering password...")
-                    await password_input.fill(self.password)
-                    
+                    password_input = self.page.locator(
+                        'input[type="password"], input[name="password"]'
+                    )
+                    await password_input.fill(self.creds.password)
+
                     # Submit login
-                    submit_button = self.page.locator('button[type="submit"], button:has-text("Sign in"), button:has-text("Login")')
-                    if await submit_button.count() > 0:
+                    if state['submitButton']:
                         logger.info("Submitting login...")
+                        submit_button = self.page.locator(
+                            'button[type="submit"], button:has-text("Sign in"), button:has-text("Login")'
+                        )
                         await submit_button.click()
-                        
-                        # Wait for navigation
-                        await self.page.wait_for_timeout(5000)
-                        
+
+                        # Wait for the post-login navigation instead of
+                        # a blanket five seconds
+                        try:
+                            await self.page.wait_for_url(
+                                re.compile(r'(dashboard|projects|new)'), timeout=15000
+                            )
+                        except PlaywrightTimeoutError:
+                            pass  # URL may not change; the probe decides
+
                         # Check if login successful
-                        if await self.page.locator('button:has-text("New Project")').count() > 0:
+                        state = await self.page.evaluate(_LOGIN_STATE_JS)
+                        if state['newProject']:
                             logger.info("Login successful!")
+                            await self._save_login_state()
                             return True
             
             # Alternative: OAuth login (Google, GitHub, etc.)
@@ -146,36 +392,49 @@ class LovableAutomator:
         """
         try:
             logger.info("Creating new project...")
-            
-            # Look for New Project button
-            new_project_btn = self.page.locator('button:has-text("New Project"), button:has-text("New"), button:has-text("Create")')
-            
-            if await new_project_btn.count() > 0:
-                await new_project_btn.first.click()
-                await self.page.wait_for_timeout(2000)
-            else:
-                # Try to navigate directly to new project
-                await self.page.goto('https://lovable.dev/new', wait_until='networkidle')
-                await self.page.wait_for_timeout(2000)
-            
+
+            # Navigate straight to /new: one navigation instead of
+            # find-button, click, JS route, re-render
+            await self.page.goto('https://lovable.dev/new', wait_until='domcontentloaded')
+            try:
+                await self.page.wait_for_selector(
+                    'textarea, [contenteditable="true"]', timeout=10000
+                )
+            except PlaywrightTimeoutError:
+                pass  # fall back to the button flow below
+
             # Find the prompt input area
-            prompt_input = self.page.locator('textarea, [contenteditable="true"], input[type="text"][placeholder*="describe" i]')
+            prompt_input = await self._locate('prompt_input')
+
+            # Fallback: some states (e.g. onboarding) don't serve /new
+            # directly, so click through the dashboard button instead
+            if await prompt_input.count() == 0:
+                new_project_btn = await self._locate('new_project')
+                if await new_project_btn.count() > 0:
+                    await new_project_btn.first.click()
+                    try:
+                        await self.page.wait_for_selector(
+                            'textarea, [contenteditable="true"]', timeout=15000
+                        )
+                    except PlaywrightTimeoutError:
+                        pass  # the prompt-input probe below handles absence
+                    prompt_input = await self._locate('prompt_input')
             
             if await prompt_input.count() > 0:
                 logger.info("Entering prompt...")
+                # fill() already awaits actionability; no settle delay
                 await prompt_input.first.fill(prompt)
-                await self.page.wait_for_timeout(1000)
-                
+
                 # Find and click generate/submit button
-                generate_btn = self.page.locator('button:has-text("Generate"), button:has-text("Create"), button:has-text("Build"), button[type="submit"]')
+                generate_btn = await self._locate('generate')
                 
                 if await generate_btn.count() > 0:
                     logger.info("Submitting prompt...")
                     await generate_btn.first.click()
-                    
-                    # Wait for generation to start
-                    await self.page.wait_for_timeout(3000)
-                    
+
+                    # No fixed settle delay: wait_for_preview_url
+                    # starts probing eagerly and backs off on its own
+
                     # Wait for preview URL to appear (max 3 minutes)
                     logger.info("Waiting for website generation...")
                     preview_url = await self.wait_for_preview_url(timeout=180000)
@@ -204,42 +463,89 @@ class LovableAutomator:
         Returns:
             str: Preview URL if found
         """
-        start_time = time.time()
-        max_time = start_time + (timeout / 1000)
-        
-        while time.time() < max_time:
+        # Event-driven fast path: a MutationObserver in the page pushes
+        # the URL over a binding the instant it appears. The probe loop
+        # runs alongside as the fallback, since a navigation silently
+        # kills the observer.
+        waiters = set()
+        try:
+            waiters.add(await self._install_preview_observer())
+        except Exception as e:
+            logger.debug(f"Preview observer unavailable: {str(e)}")
+
+        # One cancellation point: the outer wait cancels both paths
+        # when the budget runs out, instead of the loop re-checking
+        # wall-clock time (which jumps on NTP) on every spin
+        probe_task = asyncio.create_task(self._probe_loop())
+        waiters.add(probe_task)
+        try:
+            done, _ = await asyncio.wait(
+                waiters, timeout=timeout / 1000,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            for waiter in done:
+                if waiter.exception() is None and waiter.result():
+                    return waiter.result()
+            return None
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _install_preview_observer(self) -> asyncio.Future:
+        """Arm the in-page observer; returns the future it resolves"""
+        self._preview_found = asyncio.get_running_loop().create_future()
+        # The binding survives for the page's lifetime; only the
+        # observer needs re-arming per wait
+        if not self._preview_binding_installed:
+            await self.page.expose_binding('onPreviewFound', self._on_preview_found)
+            self._preview_binding_installed = True
+        await self.page.evaluate(_PREVIEW_OBSERVER_JS)
+        return self._preview_found
+
+    def _on_preview_found(self, source, url):
+        future = self._preview_found
+        if future is not None and not future.done() and url:
+            future.set_result(url)
+
+    async def _probe_loop(self) -> str:
+        """Probe until a preview URL appears; cancelled by the caller"""
+        # All the attribute-carrying candidates in one selector, so one
+        # event-driven wait replaces four separate locator probes
+        candidate_selector = (
+            'iframe[src*="lovableproject"], iframe[src*="vercel"], iframe[src*="netlify"], '
+            'a[href*="lovableproject"], a[href*="vercel"], a[href*="netlify"]'
+        )
+
+        # Exponential backoff between fallback probes: start eager
+        # (generation may finish fast), back off to the old 2 s tick
+        delay_ms = 100
+
+        while True:
             try:
-                # Check for preview URL in various possible locations
-                
-                # Method 1: Look for iframe with preview
-                iframe = self.page.locator('iframe[src*="lovableproject"], iframe[src*="vercel"], iframe[src*="netlify"]')
-                if await iframe.count() > 0:
-                    src = await iframe.first.get_attribute('src')
-                    if src and src.startswith('http'):
-                        return src
-                
-                # Method 2: Look for preview link
-                preview_link = self.page.locator('a[href*="lovableproject"], a[href*="vercel"], a[href*="netlify"], a:has-text("Preview"), a:has-text("View")')
-                if await preview_link.count() > 0:
-                    href = await preview_link.first.get_attribute('href')
-                    if href and href.startswith('http'):
-                        return href
-                
-                # Method 3: Look for URL in text
-                url_text = self.page.locator('text=/https:\\/\\/[\\w\\-]+\\.(lovableproject|vercel|netlify)\\.\\w+/')
-                if await url_text.count() > 0:
-                    text = await url_text.first.text_content()
-                    # Extract URL from text
-                    import re
-                    url_match = re.search(r'https://[\w\-]+\.(lovableproject|vercel|netlify)\.\w+', text)
-                    if url_match:
-                        return url_match.group(0)
-                
-                # Method 4: Check current URL for project ID
-                current_url = self.page.url
+                # Block until any candidate iframe/link attaches -
+                # returns the moment it appears instead of sleeping
+                # fixed ticks between count() calls
+                try:
+                    await self.page.wait_for_selector(
+                        candidate_selector, state='attached', timeout=5000
+                    )
+                except PlaywrightTimeoutError:
+                    pass  # no candidate yet; the batch probe still runs
+
+                # All detection methods in one evaluate: iframe src,
+                # link href, URL in page text, current location - one
+                # CDP round-trip instead of up to eight locator calls
+                data = await self.page.evaluate(_PREVIEW_PROBE_JS)
+
+                for url in (data['iframe'], data['link'], data['text']):
+                    if url and url.startswith('http'):
+                        return url
+
+                # Last resort: derive the preview URL from the project
+                # ID in the page's own location
+                current_url = data['url']
                 if 'project' in current_url or 'preview' in current_url:
-                    # Extract project ID and construct preview URL
-                    project_match = re.search(r'project/([a-zA-Z0-9\-]+)', current_url)
+                    project_match = _PROJECT_ID_RE.search(current_url)
                     if project_match:
                         project_id = project_match.group(1)
                         # Common preview URL patterns
@@ -250,14 +556,16 @@ class LovableAutomator:
                         ]
                         # Return the first one (actual pattern depends on Lovable's setup)
                         return possible_urls[0]
-                
-                await self.page.wait_for_timeout(2000)
-                
+
+                await self.page.wait_for_timeout(delay_ms)
+                delay_ms = min(delay_ms * 2, 2000)
+
+            except asyncio.CancelledError:
+                raise  # outer wait_for timeout; don't swallow it
             except Exception as e:
                 logger.debug(f"Error while waiting for preview: {str(e)}")
-                await self.page.wait_for_timeout(2000)
-        
-        return None
+                await self.page.wait_for_timeout(delay_ms)
+                delay_ms = min(delay_ms * 2, 2000)
     
     async def generate_website(self, prompt: str, retry_count: int = 3) -> Tuple[bool, Optional[str], Optional[str]]:
         """
@@ -277,12 +585,14 @@ class LovableAutomator:
                 attempt += 1
                 logger.info(f"Attempt {attempt}/{retry_count}")
                 
-                # Initialize browser if not already done
-                if not self.browser:
+                # Initialize context/page if not already done - checked
+                # via self.page, not self.browser, because an injected
+                # shared browser arrives with no context yet
+                if not self.page:
                     await self.initialize_browser()
                 
                 # Login to Lovable
-                if not self.email or not self.password:
+                if not self.creds:
                     return False, None, "Lovable credentials not provided"
                 
                 login_success = await self.login_to_lovable()
@@ -315,22 +625,67 @@ class LovableAutomator:
         
         return False, None, "Maximum retry attempts reached"
     
-    async def take_screenshot(self, filename: str = "lovable_screenshot.png"):
-        """Take screenshot of current page"""
+    async def take_screenshot(self, filename: str = "lovable_screenshot.jpg",
+                              quality: int = 60):
+        """Take a viewport screenshot of the current page
+
+        JPEG at modest quality: an order of magnitude smaller and faster
+        to encode than full-page PNG, and plenty for a visual check.
+        """
         if self.page:
-            await self.page.screenshot(path=filename)
+            await self.page.screenshot(
+                path=filename, type='jpeg', quality=quality, full_page=False
+            )
             logger.info(f"Screenshot saved to {filename}")
 
 
 class LovableService:
     """Service layer for Lovable automation"""
     
-    def __init__(self, email: str = None, password: str = None):
+    def __init__(self, email: str = None, password: str = None,
+                 creds: Credentials = None):
         """Initialize Lovable service"""
-        self.email = email or os.getenv('LOVABLE_EMAIL', '')
-        self.password = password or os.getenv('LOVABLE_PASSWORD', '')
-    
-    async def generate_from_requirements(self, project_id: str, prompt: str, 
+        if creds is None:
+            creds = Credentials(email, password) if email or password \
+                else Credentials.from_env()
+        self.creds = creds
+        self._playwright = None
+        self._browser = None
+        # Serializes the launch: generate_batch admits several tasks at
+        # once, and without the lock each would start its own Chromium
+        self._browser_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _ensure_browser(self, headless: bool) -> Browser:
+        """Launch the shared browser on first use and reuse it after"""
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                # Reconnect path: stop the old driver before replacing
+                # it, or its process leaks with no handle left
+                if self._playwright is not None:
+                    await self._playwright.stop()
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=headless,
+                    args=_BROWSER_ARGS
+                )
+            return self._browser
+
+    async def close(self):
+        """Shut down the shared browser"""
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def generate_from_requirements(self, project_id: str, prompt: str,
                                         headless: bool = False) -> Dict:
         """
         Generate website from requirements
@@ -343,12 +698,15 @@ class LovableService:
         Returns:
             Dict with generation results
         """
+        # Reuse the service-wide browser: each call gets a fresh
+        # isolated context, but skips the multi-second Chromium launch
+        browser = await self._ensure_browser(headless)
         automator = LovableAutomator(
-            email=self.email,
-            password=self.password,
-            headless=headless
+            creds=self.creds,
+            headless=headless,
+            browser=browser
         )
-        
+
         result = {
             'project_id': project_id,
             'started_at': datetime.now().isoformat(),
@@ -366,20 +724,61 @@ class LovableService:
             result['error'] = error
             result['completed_at'] = datetime.now().isoformat()
             
-            # Take screenshot if successful
-            if success and not headless:
-                await automator.take_screenshot(f"preview_{project_id}.png")
+            # Screenshots are debugging aids, not part of the product
+            # flow - only pay for them when explicitly asked
+            if success and os.getenv('LOVABLE_SCREENSHOT') == '1':
+                await automator.take_screenshot(f"preview_{project_id}.jpg")
             
         except Exception as e:
             result['error'] = str(e)
             logger.error(f"Service error: {str(e)}")
         
         finally:
-            # Clean up
+            # Clean up this call's context; the shared browser stays up
             await automator.close_browser()
-        
+
         return result
 
+    async def generate_batch(self, items: list, concurrency: int = 4,
+                             headless: bool = True) -> list:
+        """
+        Generate several websites concurrently over the shared browser
+
+        Each item gets its own isolated context, so logins and pages
+        never bleed between generations; the semaphore keeps at most
+        `concurrency` contexts rendering at once.
+
+        Args:
+            items: List of (project_id, prompt) tuples
+            concurrency: Maximum generations in flight at once
+            headless: Run browser in headless mode
+
+        Returns:
+            List of result dicts, one per item, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(project_id: str, prompt: str) -> Dict:
+            async with semaphore:
+                return await self.generate_from_requirements(
+                    project_id, prompt, headless=headless
+                )
+
+        tasks = [
+            asyncio.create_task(bounded(project_id, prompt))
+            for project_id, prompt in items
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return [
+            result if isinstance(result, dict) else {
+                'project_id': item[0],
+                'success': False,
+                'preview_url': None,
+                'error': str(result)
+            }
+            for item, result in zip(items, results)
+        ]
+
 
 # Testing function
 async def test_lovable_automation():
@@ -389,11 +788,10 @@ async def test_lovable_automation():
     print("LOVABLE AUTOMATION TEST")
     print("=" * 60)
     
-    # Check for credentials
-    email = os.getenv('LOVABLE_EMAIL')
-    password = os.getenv('LOVABLE_PASSWORD')
-    
-    if not email or not password:
+    # Check for credentials (resolved once, passed through)
+    creds = Credentials.from_env()
+
+    if not creds:
         print("\n⚠️  Lovable credentials not found!")
         print("Please set environment variables:")
         print("  export LOVABLE_EMAIL='your-email@example.com'")
@@ -416,21 +814,20 @@ async def test_lovable_automation():
     Primary Color: #1a1a1a
     """
     
-    print(f"\nUsing email: {email}")
+    print(f"\nUsing email: {creds.email}")
     print("\nTest Prompt:")
     print("-" * 40)
     print(test_prompt)
     print("-" * 40)
     
     # Run automation
-    service = LovableService(email, password)
-    
-    print("\nStarting automation (this may take 2-3 minutes)...")
-    result = await service.generate_from_requirements(
-        project_id="test_" + str(int(time.time())),
-        prompt=test_prompt,
-        headless=False  # Set to True for headless mode
-    )
+    async with LovableService(creds=creds) as service:
+        print("\nStarting automation (this may take 2-3 minutes)...")
+        result = await service.generate_from_requirements(
+            project_id="test_" + str(int(time.time())),
+            prompt=test_prompt,
+            headless=False  # Set to True for headless mode
+        )
     
     # Display results
     print("\n" + "=" * 60)
@@ -4,75 +4,214 @@ Requirements collector for RevampSite
 Collects user requirements through conversational interface
 """
 
+import functools
 import os
 import json
 import re
-from typing import Dict, List, Optional, Tuple
+import secrets
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+# Splits keyword answers on commas/whitespace in one pass, without the
+# intermediate string that replace(',', ' ') allocates
+_KEYWORD_SPLIT_RE = re.compile(r'[,\s]+')
+
+# Hashed membership beats scanning a list rebuilt per call
+_COMMON_COLORS = frozenset({
+    'red', 'blue', 'green', 'yellow', 'orange', 'purple',
+    'pink', 'black', 'white', 'gray', 'grey', 'brown',
+})
+
+# Tone keywords are a validated comma-separated list, so exact token
+# membership is cheaper and safer than substring scans ('modern' no
+# longer matches 'postmodernism'). Checked in priority order.
+_STYLE_CHOICES = (
+    (frozenset({'modern', 'minimal'}), "- Style: Clean, minimalist, modern"),
+    (frozenset({'luxury', 'elegant'}), "- Style: Elegant, sophisticated, premium"),
+    (frozenset({'fun', 'casual'}), "- Style: Friendly, approachable, vibrant"),
+)
+_DEFAULT_STYLE_LINE = "- Style: Professional, trustworthy"
+
+# The goal stays free text, so keep the substring alternation there
+# (no \b: 'product' must still match 'products')
+_GOAL_RE = re.compile(r'portfolio|showcase|booking|appointment|sell|product')
+_GOAL_SECTIONS = {
+    'portfolio': ("3. Portfolio/Gallery showcasing work",
+                  "4. Services section with detailed offerings"),
+    'showcase': ("3. Portfolio/Gallery showcasing work",
+                 "4. Services section with detailed offerings"),
+    'booking': ("3. Services with pricing",
+                "4. Booking/Contact form for appointments"),
+    'appointment': ("3. Services with pricing",
+                    "4. Booking/Contact form for appointments"),
+    'sell': ("3. Products/Services showcase",
+             "4. Features and benefits section"),
+    'product': ("3. Products/Services showcase",
+                "4. Features and benefits section"),
+}
+_DEFAULT_GOAL_SECTIONS = ("3. Services or products section",
+                          "4. Blog or resources section")
+
+# Invariant prompt blocks built once at import; appending one
+# pre-joined string beats appending each line separately
+_SECTIONS_HEADER = (
+    "\nWebsite Sections:\n"
+    "1. Hero section with compelling headline and call-to-action\n"
+    "2. About section explaining the business"
+)
+_SECTIONS_FOOTER = (
+    "5. Contact section with form and social links\n"
+    "6. Footer with copyright and links\n"
+    "\nTechnical Requirements:\n"
+    "- Mobile responsive design\n"
+    "- SEO optimized\n"
+    "- Fast loading\n"
+    "- Accessible"
+)
+
+
+# The question flow is compile-time constant; built once at import and
+# shared by every collector instance. Never mutated - get_next_question
+# copies before stitching in defaults.
+_QUESTIONS = (
+    {
+        "id": "brand_name",
+        "question": "What's your brand or business name? (If different from your Instagram handle)",
+        "type": "text",
+        "required": False,
+        "default_from": "instagram_username",
+        "validation": "text",
+        "follow_up": "Great! I'll use '{answer}' as your brand name."
+    },
+    {
+        "id": "tone_keywords",
+        "question": "Describe your brand personality in 3 keywords (e.g., 'modern, professional, friendly' or 'luxury, elegant, exclusive')",
+        "type": "keywords",
+        "required": True,
+        "validation": "keywords",
+        "examples": ["modern, professional, friendly", "luxury, elegant, exclusive", "fun, casual, vibrant"],
+        "follow_up": "Perfect! Your brand tone is: {answer}"
+    },
+    {
+        "id": "target_audience",
+        "question": "Who is your target audience? (e.g., 'young professionals', 'local families', 'fitness enthusiasts')",
+        "type": "text",
+        "required": True,
+        "validation": "text",
+        "examples": ["young professionals", "local families", "fitness enthusiasts", "small business owners"],
+        "follow_up": "Got it! Targeting: {answer}"
+    },
+    {
+        "id": "primary_color",
+        "question": "Do you have a preferred primary color for your website? (or type 'auto' to use colors from your Instagram)",
+        "type": "color",
+        "required": False,
+        "default": "auto",
+        "validation": "color",
+        "follow_up": "Color preference noted: {answer}"
+    },
+    {
+        "id": "main_goal",
+        "question": "What's the main goal of your website? (e.g., 'showcase portfolio', 'get bookings', 'sell products', 'share information')",
+        "type": "text",
+        "required": True,
+        "validation": "text",
+        "examples": ["showcase portfolio", "get bookings", "sell products", "share information"],
+        "follow_up": "Excellent! Main goal: {answer}"
+    },
+)
+
+# Required ids are as fixed as the questions; a live counter per
+# collector then makes is_complete() a single comparison
+_REQUIRED_IDS = frozenset(q['id'] for q in _QUESTIONS if q.get('required', True))
+
+
+class _SafeDict(dict):
+    """format_map helper: unknown placeholders render as empty"""
+
+    def __missing__(self, key):
+        return ''
+
+
+@functools.lru_cache(maxsize=512)
+def _validate(validation_type: str, answer: str, required: bool) -> Tuple[bool, str]:
+    """Validate a stripped answer; pure, so resubmissions hit the cache
+
+    Users commonly resubmit the same value after a validation error,
+    and every argument/result is an immutable scalar - safe to memoize.
+    """
+    if required and not answer:
+        return False, ""
+
+    if validation_type == 'text':
+        # Basic text validation - just check it's not empty if required
+        return (True, answer) if answer or not required else (False, "")
+
+    elif validation_type == 'keywords':
+        # Clean up keywords - remove extra spaces, normalize
+        keywords = [k for k in _KEYWORD_SPLIT_RE.split(answer) if k]
+        if len(keywords) < 2:
+            return False, ""
+        # Return first 5 keywords max
+        return True, ', '.join(keywords[:5])
+
+    elif validation_type == 'color':
+        # Validate color input (lowercased once for all branches)
+        answer_lower = answer.lower()
+        if answer_lower == 'auto':
+            return True, 'auto'
+
+        # Check for hex color: int(s, 16) validates six hex chars
+        # without entering the regex engine. The isascii/isalnum
+        # guard rejects signs, underscores and unicode digits that
+        # int() would otherwise tolerate.
+        hex_part = answer[1:] if answer.startswith('#') else answer
+        if len(hex_part) == 6 and hex_part.isascii() and hex_part.isalnum():
+            try:
+                int(hex_part, 16)
+                return True, f"#{hex_part}"
+            except ValueError:
+                pass
+
+        # Check for common color names
+        if answer_lower in _COMMON_COLORS:
+            return True, answer_lower
+
+        return False, ""
+
+    return True, answer
+
+
 class RequirementsCollector:
     """Manages requirements collection through conversation"""
-    
+
     def __init__(self):
         """Initialize requirements collector"""
-        self.questions = self._initialize_questions()
+        self.questions = _QUESTIONS
         self.current_step = 0
+        self._required_ids = _REQUIRED_IDS
         self.collected_data = {}
         self.instagram_data = {}
-    
-    def _initialize_questions(self) -> List[Dict]:
-        """Initialize the question flow"""
-        return [
-            {
-                "id": "brand_name",
-                "question": "What's your brand or business name? (If different from your Instagram handle)",
-                "type": "text",
-                "required": False,
-                "default_from": "instagram_username",
-                "validation": "text",
-                "follow_up": "Great! I'll use '{answer}' as your brand name."
-            },
-            {
-                "id": "tone_keywords", 
-                "question": "Describe your brand personality in 3 keywords (e.g., 'modern, professional, friendly' or 'luxury, elegant, exclusive')",
-                "type": "keywords",
-                "required": True,
-                "validation": "keywords",
-                "examples": ["modern, professional, friendly", "luxury, elegant, exclusive", "fun, casual, vibrant"],
-                "follow_up": "Perfect! Your brand tone is: {answer}"
-            },
-            {
-                "id": "target_audience",
-                "question": "Who is your target audience? (e.g., 'young professionals', 'local families', 'fitness enthusiasts')",
-                "type": "text",
-                "required": True,
-                "validation": "text",
-                "examples": ["young professionals", "local families", "fitness enthusiasts", "small business owners"],
-                "follow_up": "Got it! Targeting: {answer}"
-            },
-            {
-                "id": "primary_color",
-                "question": "Do you have a preferred primary color for your website? (or type 'auto' to use colors from your Instagram)",
-                "type": "color",
-                "required": False,
-                "default": "auto",
-                "validation": "color",
-                "follow_up": "Color preference noted: {answer}"
-            },
-            {
-                "id": "main_goal",
-                "question": "What's the main goal of your website? (e.g., 'showcase portfolio', 'get bookings', 'sell products', 'share information')",
-                "type": "text",
-                "required": True,
-                "validation": "text",
-                "examples": ["showcase portfolio", "get bookings", "sell products", "share information"],
-                "follow_up": "Excellent! Main goal: {answer}"
-            }
-        ]
-    
+        # Memoized prompt keyed by an input fingerprint; UI refreshes
+        # and retries rebuild the same prompt repeatedly otherwise
+        self._prompt_cache = {}
+
+    @property
+    def collected_data(self) -> Dict:
+        return self._collected_data
+
+    @collected_data.setter
+    def collected_data(self, data: Dict):
+        # Callers (app.build_collector) assign the dict wholesale;
+        # recount so the completion counter never desyncs
+        self._collected_data = data
+        self._remaining_required = len(self._required_ids - data.keys())
+
     def set_instagram_data(self, instagram_data: Dict):
         """Set Instagram data for context"""
         self.instagram_data = instagram_data
+        self._prompt_cache.clear()
         
         # Pre-fill some defaults from Instagram
         if instagram_data:
@@ -89,18 +228,40 @@ class RequirementsCollector:
             self.collected_data['bio_context'] = bio[:200] if bio else ''
     
     def get_next_question(self) -> Optional[Dict]:
-        """Get the next question to ask"""
+        """Get the next question to ask
+
+        The returned dict is shared state - treat it as read-only.
+        """
         if self.current_step < len(self.questions):
-            question = self.questions[self.current_step].copy()
-            
-            # Add context from Instagram if available
-            if question['id'] == 'brand_name' and self.collected_data.get('brand_name_default'):
-                question['default'] = self.collected_data['brand_name_default']
-                question['question'] += f" (Press Enter to use '{question['default']}')"
-            
+            question = self.questions[self.current_step]
+
+            # Only brand_name ever needs a stitched-in default; every
+            # other question returns uncopied (the UI polls this)
+            default = self.collected_data.get('brand_name_default')
+            if question['id'] == 'brand_name' and default:
+                return {
+                    **question,
+                    'default': default,
+                    'question': question['question'] + f" (Press Enter to use '{default}')",
+                }
+
             return question
         return None
-    
+
+    def iter_questions(self) -> Iterator[Dict]:
+        """Yield the pending question until the flow is complete
+
+        Generator form of the get_next_question()/is_complete() polling
+        loop; the caller answers via process_answer between yields. A
+        rejected answer leaves current_step in place, so the same
+        question comes around again.
+        """
+        while not self.is_complete():
+            question = self.get_next_question()
+            if question is None:
+                return
+            yield question
+
     def process_answer(self, answer: str, question_id: str = None) -> Tuple[bool, str, Optional[Dict]]:
         """
         Process user answer
@@ -110,9 +271,13 @@ class RequirementsCollector:
             question_id = self.questions[self.current_step]['id']
         
         question = self.questions[self.current_step]
-        
+
+        # Strip once; the validator and the empty-answer check both
+        # want the trimmed form
+        answer = answer.strip()
+
         # Handle empty answers for optional questions
-        if not answer.strip() and not question.get('required', True):
+        if not answer and not question.get('required', True):
             if question.get('default'):
                 answer = question['default']
             elif question.get('default_from') and self.collected_data.get(question['default_from']):
@@ -125,13 +290,18 @@ class RequirementsCollector:
             error_msg = self._get_validation_error(question)
             return False, error_msg, question
         
-        # Store answer
+        # Store answer (invalidates any memoized prompt)
+        if question_id in self._required_ids and question_id not in self.collected_data:
+            self._remaining_required -= 1
         self.collected_data[question_id] = cleaned_answer
+        self._prompt_cache.clear()
         
-        # Generate follow-up message
-        follow_up = question.get('follow_up', 'Got it!')
-        if '{answer}' in follow_up:
-            follow_up = follow_up.replace('{answer}', cleaned_answer)
+        # Generate follow-up message; format_map jumps straight to the
+        # placeholders (no pre-scan for '{answer}') and lets templates
+        # reference any collected field, not just the answer
+        follow_up = question.get('follow_up', 'Got it!').format_map(
+            _SafeDict(self.collected_data, answer=cleaned_answer)
+        )
         
         # Move to next question
         self.current_step += 1
@@ -141,45 +311,12 @@ class RequirementsCollector:
     
     def _validate_answer(self, answer: str, question: Dict) -> Tuple[bool, str]:
         """Validate answer based on question type"""
-        answer = answer.strip()
-        
-        if question.get('required', True) and not answer:
-            return False, ""
-        
-        validation_type = question.get('validation', 'text')
-        
-        if validation_type == 'text':
-            # Basic text validation - just check it's not empty if required
-            return (True, answer) if answer or not question.get('required', True) else (False, "")
-        
-        elif validation_type == 'keywords':
-            # Clean up keywords - remove extra spaces, normalize
-            keywords = [k.strip() for k in answer.replace(',', ' ').split() if k.strip()]
-            if len(keywords) < 2:
-                return False, ""
-            # Return first 5 keywords max
-            return True, ', '.join(keywords[:5])
-        
-        elif validation_type == 'color':
-            # Validate color input
-            if answer.lower() == 'auto':
-                return True, 'auto'
-            
-            # Check for hex color
-            hex_match = re.match(r'^#?([A-Fa-f0-9]{6})$', answer)
-            if hex_match:
-                return True, f"#{hex_match.group(1)}"
-            
-            # Check for common color names
-            common_colors = ['red', 'blue', 'green', 'yellow', 'orange', 'purple', 
-                           'pink', 'black', 'white', 'gray', 'grey', 'brown']
-            if answer.lower() in common_colors:
-                return True, answer.lower()
-            
-            return False, ""
-        
-        return True, answer
-    
+        return _validate(
+            question.get('validation', 'text'),
+            answer.strip(),
+            question.get('required', True),
+        )
+
     def _get_validation_error(self, question: Dict) -> str:
         """Get validation error message"""
         validation_type = question.get('validation', 'text')
@@ -193,8 +330,7 @@ class RequirementsCollector:
     
     def is_complete(self) -> bool:
         """Check if all required questions have been answered"""
-        required_fields = [q['id'] for q in self.questions if q.get('required', True)]
-        return all(field in self.collected_data for field in required_fields)
+        return self._remaining_required == 0
     
     def get_summary(self) -> Dict:
         """Get summary of collected requirements"""
@@ -218,7 +354,19 @@ class RequirementsCollector:
         """Generate a prompt for Lovable.dev based on collected requirements"""
         req = self.collected_data
         ig = self.instagram_data
-        
+
+        # The prompt is deterministic in its inputs; fingerprint them
+        # and hand back the cached string on repeat calls
+        cache_key = hash((
+            tuple(sorted(req.items())),
+            ig.get('username'),
+            ig.get('biography', ''),
+            len(ig.get('posts', [])),
+        ))
+        cached = self._prompt_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Build comprehensive prompt
         prompt_parts = []
         
@@ -252,52 +400,50 @@ class RequirementsCollector:
             color_strs = [f"rgb({c['r']}, {c['g']}, {c['b']})" for c in colors]
             prompt_parts.append(f"- Brand Colors: {', '.join(color_strs)}")
         
-        # Style based on tone keywords
-        tone = req.get('tone_keywords', '').lower()
-        if 'modern' in tone or 'minimal' in tone:
-            prompt_parts.append("- Style: Clean, minimalist, modern")
-        elif 'luxury' in tone or 'elegant' in tone:
-            prompt_parts.append("- Style: Elegant, sophisticated, premium")
-        elif 'fun' in tone or 'casual' in tone:
-            prompt_parts.append("- Style: Friendly, approachable, vibrant")
+        # Style based on tone keywords: tokenize once, then O(1)
+        # set intersections in priority order
+        tone_tokens = frozenset(
+            t for t in _KEYWORD_SPLIT_RE.split(req.get('tone_keywords', '').lower()) if t
+        )
+        for style_tokens, style_line in _STYLE_CHOICES:
+            if not style_tokens.isdisjoint(tone_tokens):
+                break
         else:
-            prompt_parts.append("- Style: Professional, trustworthy")
+            style_line = _DEFAULT_STYLE_LINE
+        prompt_parts.append(style_line)
         
         # Sections to include
-        prompt_parts.append("\nWebsite Sections:")
-        prompt_parts.append("1. Hero section with compelling headline and call-to-action")
-        prompt_parts.append("2. About section explaining the business")
-        
-        # Add sections based on goal
+        prompt_parts.append(_SECTIONS_HEADER)
+
+
+        # Add sections based on goal: single scan, dict dispatch
         goal = req.get('main_goal', '').lower()
-        if 'portfolio' in goal or 'showcase' in goal:
-            prompt_parts.append("3. Portfolio/Gallery showcasing work")
-            prompt_parts.append("4. Services section with detailed offerings")
-        elif 'booking' in goal or 'appointment' in goal:
-            prompt_parts.append("3. Services with pricing")
-            prompt_parts.append("4. Booking/Contact form for appointments")
-        elif 'sell' in goal or 'product' in goal:
-            prompt_parts.append("3. Products/Services showcase")
-            prompt_parts.append("4. Features and benefits section")
-        else:
-            prompt_parts.append("3. Services or products section")
-            prompt_parts.append("4. Blog or resources section")
-        
-        prompt_parts.append("5. Contact section with form and social links")
-        prompt_parts.append("6. Footer with copyright and links")
-        
-        # Technical requirements
-        prompt_parts.append("\nTechnical Requirements:")
-        prompt_parts.append("- Mobile responsive design")
-        prompt_parts.append("- SEO optimized")
-        prompt_parts.append("- Fast loading")
-        prompt_parts.append("- Accessible")
+        goal_match = _GOAL_RE.search(goal)
+        prompt_parts.extend(
+            _GOAL_SECTIONS[goal_match.group(0)] if goal_match else _DEFAULT_GOAL_SECTIONS
+        )
         
+        # Closing sections and technical requirements (invariant)
+        prompt_parts.append(_SECTIONS_FOOTER)
+
+
         # Instagram integration hint
         if ig.get('posts'):
             prompt_parts.append(f"\nInclude imagery that matches their Instagram aesthetic (@{ig.get('username')})")
-        
-        return "\n".join(prompt_parts)
+
+        prompt = "\n".join(prompt_parts)
+        self._prompt_cache[cache_key] = prompt
+        return prompt
+
+
+@dataclass
+class Message:
+    """One chat message; slotted so long conversations stay compact"""
+    __slots__ = ('role', 'content', 'timestamp', 'question_id')
+    role: str
+    content: str
+    timestamp: str
+    question_id: Optional[str]
 
 
 class ConversationManager:
@@ -307,101 +453,104 @@ class ConversationManager:
         """Initialize conversation manager"""
         self.project_id = project_id
         self.collector = RequirementsCollector()
+        self._question_count = len(self.collector.questions)
         self.messages = []
         self.session_id = self._generate_session_id()
     
     def _generate_session_id(self) -> str:
         """Generate unique session ID"""
-        import hashlib
-        import time
-        timestamp = str(time.time())
-        return hashlib.md5(f"{self.project_id}_{timestamp}".encode()).hexdigest()[:16]
+        # Random hex straight from the OS: no float formatting, no MD5,
+        # and collision-free without depending on the clock
+        return secrets.token_hex(8)
     
     def start_conversation(self, instagram_data: Dict = None) -> Dict:
         """Start the conversation"""
         self.collector.set_instagram_data(instagram_data or {})
-        
+
+        # One timestamp for every message built in this turn
+        ts = datetime.now().isoformat()
+
         # Add welcome message
-        welcome = {
-            "role": "assistant",
-            "content": "Hi! I'll help you create a website from your Instagram profile. I just need to ask you a few quick questions to understand your brand better. This will take about 2 minutes.",
-            "timestamp": datetime.now().isoformat()
-        }
-        self.messages.append(welcome)
-        
+        self.messages.append(Message(
+            role="assistant",
+            content="Hi! I'll help you create a website from your Instagram profile. I just need to ask you a few quick questions to understand your brand better. This will take about 2 minutes.",
+            timestamp=ts,
+            question_id=None
+        ))
+
         # Get first question
         first_question = self.collector.get_next_question()
         if first_question:
-            question_msg = {
-                "role": "assistant", 
-                "content": first_question['question'],
-                "question_id": first_question['id'],
-                "timestamp": datetime.now().isoformat()
-            }
-            self.messages.append(question_msg)
-        
+            self.messages.append(Message(
+                role="assistant",
+                content=first_question['question'],
+                timestamp=ts,
+                question_id=first_question['id']
+            ))
+
         return {
             "session_id": self.session_id,
-            "messages": self.messages,
+            "messages": self._serialized_messages(),
             "current_question": first_question,
-            "progress": f"1/{len(self.collector.questions)}"
+            "progress": f"1/{self._question_count}"
         }
     
     def process_user_input(self, user_input: str) -> Dict:
         """Process user input and return response"""
+        # One timestamp for every message built in this turn: the 2-3
+        # messages land within microseconds of each other anyway
+        ts = datetime.now().isoformat()
+
         # Add user message
-        user_msg = {
-            "role": "user",
-            "content": user_input,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.messages.append(user_msg)
-        
+        self.messages.append(Message(
+            role="user", content=user_input, timestamp=ts, question_id=None
+        ))
+
         # Process answer
         is_valid, response, next_question = self.collector.process_answer(user_input)
-        
+
         # Add assistant response
-        assistant_msg = {
-            "role": "assistant",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.messages.append(assistant_msg)
-        
+        self.messages.append(Message(
+            role="assistant", content=response, timestamp=ts, question_id=None
+        ))
+
         # If valid and there's a next question, add it
         if is_valid and next_question:
-            question_msg = {
-                "role": "assistant",
-                "content": next_question['question'],
-                "question_id": next_question['id'],
-                "timestamp": datetime.now().isoformat()
-            }
-            self.messages.append(question_msg)
+            self.messages.append(Message(
+                role="assistant",
+                content=next_question['question'],
+                timestamp=ts,
+                question_id=next_question['id']
+            ))
         elif is_valid and not next_question:
             # Conversation complete
-            complete_msg = {
-                "role": "assistant",
-                "content": "Perfect! I have all the information I need. Now I'll generate your website. This will take about 2-3 minutes...",
-                "timestamp": datetime.now().isoformat()
-            }
-            self.messages.append(complete_msg)
-        
+            self.messages.append(Message(
+                role="assistant",
+                content="Perfect! I have all the information I need. Now I'll generate your website. This will take about 2-3 minutes...",
+                timestamp=ts,
+                question_id=None
+            ))
+
         return {
             "session_id": self.session_id,
-            "messages": self.messages,
+            "messages": self._serialized_messages(),
             "current_question": next_question,
             "is_complete": self.collector.is_complete(),
-            "progress": f"{self.collector.current_step}/{len(self.collector.questions)}",
+            "progress": f"{self.collector.current_step}/{self._question_count}",
             "requirements": self.collector.get_summary() if self.collector.is_complete() else None
         }
     
+    def _serialized_messages(self) -> List[Dict]:
+        """Messages as plain dicts for the API boundary"""
+        return [asdict(message) for message in self.messages]
+
     def get_conversation_state(self) -> Dict:
         """Get current conversation state"""
         return {
             "session_id": self.session_id,
-            "messages": self.messages,
+            "messages": self._serialized_messages(),
             "current_question": self.collector.get_next_question(),
             "is_complete": self.collector.is_complete(),
-            "progress": f"{self.collector.current_step}/{len(self.collector.questions)}",
+            "progress": f"{self.collector.current_step}/{self._question_count}",
             "requirements": self.collector.get_summary()
         }
\ No newline at end of file
@@ -1,210 +1,175 @@
 #!/usr/bin/env python3
 """
-Test script for Instagram Scraper
-Tests the scraper with sample profiles to ensure it works correctly
+Tests for the Instagram scraper.
+Run with pytest; the parametrized profile tests shard cleanly across
+xdist workers and CI jobs.
 """
 
-import json
-import sys
+import asyncio
+import fcntl
+import logging
+import os
 import time
+from pathlib import Path
+
+import orjson
+import pytest
+
 from instagram_scraper import InstagramScraper
 from config import Config
 
-def test_profile_extraction():
-    """Test basic profile data extraction"""
-    print("=" * 60)
-    print("INSTAGRAM SCRAPER TEST")
-    print("=" * 60)
-    
-    # Initialize scraper
-    scraper = InstagramScraper(use_proxy=Config.USE_PROXY)
-    
-    # Test profiles (popular public accounts that should always be available)
-    test_profiles = [
-        "cristiano",  # Cristiano Ronaldo - Sports/Celebrity
-        "nike",       # Nike - Fashion/Sports brand
-        "natgeo",     # National Geographic - Photography/Education
-    ]
-    
-    results = []
-    
-    for username in test_profiles:
-        print(f"\n[TEST] Analyzing @{username}...")
-        print("-" * 40)
-        
-        try:
-            # Get profile analysis
-            profile_data = scraper.get_full_profile_analysis(username)
-            
-            if profile_data:
-                # Display results
-                print(f"✓ Username: @{profile_data['username']}")
-                print(f"✓ Full Name: {profile_data.get('full_name', 'N/A')}")
-                print(f"✓ Followers: {profile_data.get('follower_count', 0):,}")
-                print(f"✓ Posts: {profile_data.get('post_count', 0):,}")
-                print(f"✓ Bio Length: {len(profile_data.get('biography', ''))} chars")
-                
-                # Check brand colors
-                if profile_data.get('brand_colors'):
-                    print(f"✓ Brand Colors: {len(profile_data['brand_colors'])} extracted")
-                    for i, color in enumerate(profile_data['brand_colors'][:3], 1):
-                        print(f"  Color {i}: RGB({color['r']}, {color['g']}, {color['b']})")
-                else:
-                    print("⚠ No brand colors extracted")
-                
-                # Check business info
-                business_info = profile_data.get('business_info', {})
-                if business_info:
-                    print(f"✓ Business Type: {business_info.get('business_type', 'Unknown')}")
-                    
-                    if business_info.get('tone'):
-                        print(f"✓ Brand Tone: {', '.join(business_info['tone'])}")
-                    
-                    if business_info.get('keywords'):
-                        print(f"✓ Keywords: {len(business_info['keywords'])} found")
-                        print(f"  Top 5: {', '.join(business_info['keywords'][:5])}")
-                
-                # Check posts
-                posts = profile_data.get('posts', [])
-                if posts:
-                    print(f"✓ Recent Posts: {len(posts)} retrieved")
-                    print(f"  Average likes: {sum(p.get('likes', 0) for p in posts) // len(posts):,}")
-                else:
-                    print("⚠ No posts retrieved")
-                
-                results.append({
-                    "username": username,
-                    "status": "SUCCESS",
-                    "data_points": {
-                        "profile": bool(profile_data.get('biography')),
-                        "colors": bool(profile_data.get('brand_colors')),
-                        "business_info": bool(business_info),
-                        "posts": len(posts) > 0
-                    }
-                })
-                
-            else:
-                print(f"✗ Failed to fetch profile data for @{username}")
-                results.append({
-                    "username": username,
-                    "status": "FAILED",
-                    "data_points": {}
-                })
-                
-        except Exception as e:
-            print(f"✗ Error testing @{username}: {str(e)}")
-            results.append({
-                "username": username,
-                "status": "ERROR",
-                "error": str(e),
-                "data_points": {}
-            })
-        
-        # Add delay between tests
-        if username != test_profiles[-1]:
-            print("\nWaiting before next test...")
-            time.sleep(3)
-    
-    # Summary
-    print("\n" + "=" * 60)
-    print("TEST SUMMARY")
-    print("=" * 60)
-    
-    successful = sum(1 for r in results if r["status"] == "SUCCESS")
-    failed = sum(1 for r in results if r["status"] in ["FAILED", "ERROR"])
-    
-    print(f"Total Tests: {len(results)}")
-    print(f"Successful: {successful}")
-    print(f"Failed: {failed}")
-    
-    if successful == len(results):
-        print("\n✓ ALL TESTS PASSED!")
-    else:
-        print("\n⚠ Some tests failed. Check the output above for details.")
-    
-    # Save results to file
-    with open("test_results.json", "w") as f:
-        json.dump(results, f, indent=2)
-    print(f"\nDetailed results saved to test_results.json")
-    
-    return successful == len(results)
-
-
-def test_single_profile():
-    """Test with a specific profile provided by user"""
-    print("\n" + "=" * 60)
-    print("SINGLE PROFILE TEST")
-    print("=" * 60)
-    
-    username = input("\nEnter Instagram username to test (without @): ").strip()
-    
-    if not username:
-        print("No username provided. Exiting.")
-        return False
-    
-    scraper = InstagramScraper(use_proxy=Config.USE_PROXY)
-    
-    print(f"\n[TEST] Analyzing @{username}...")
-    print("-" * 40)
-    
+# Deferred %-formatting: under a quiet run (default level WARNING)
+# these calls short-circuit before building any strings. Pass
+# --log-cli-level=INFO to see the per-profile detail.
+log = logging.getLogger(__name__)
+
+# Popular public accounts that should always be available
+TEST_PROFILES = [
+    "cristiano",  # Cristiano Ronaldo - Sports/Celebrity
+    "nike",       # Nike - Fashion/Sports brand
+    "natgeo",     # National Geographic - Photography/Education
+]
+
+# On-disk fixture cache: repeat test runs within a day skip the
+# Instagram round trips entirely. Delete .cache/ to force a refetch.
+_CACHE_DIR = Path(".cache")
+_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+
+
+@pytest.fixture(scope="session")
+def scraper():
+    """One scraper for the whole session.
+
+    InstagramScraper owns an httpx.Client with a keep-alive pool (and
+    optionally a Redis connection), so building it per test would pay
+    the TLS/TCP setup again for every profile fetch.
+    """
+    instance = InstagramScraper(use_proxy=Config.USE_PROXY)
+    yield instance
+    instance.client.close()
+
+
+def _load_cached_profile(username):
+    """Return the cached analysis for ``username`` if fresh, else None"""
+    path = _CACHE_DIR / f"{username}.json"
     try:
-        profile_data = scraper.get_full_profile_analysis(username)
-        
-        if profile_data:
-            # Save full data
-            filename = f"{username}_test.json"
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(profile_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"\n✓ Profile data successfully extracted!")
-            print(f"✓ Data saved to {filename}")
-            
-            # Quick stats
-            print("\nQuick Stats:")
-            print(f"- Followers: {profile_data.get('follower_count', 0):,}")
-            print(f"- Posts analyzed: {len(profile_data.get('posts', []))}")
-            print(f"- Brand colors found: {len(profile_data.get('brand_colors', []))}")
-            print(f"- Business type: {profile_data.get('business_info', {}).get('business_type', 'Unknown')}")
-            
-            return True
-        else:
-            print(f"✗ Failed to fetch profile data for @{username}")
-            return False
-            
-    except Exception as e:
-        print(f"✗ Error: {str(e)}")
-        return False
-
-
-def main():
-    """Main test runner"""
-    print("\nRevampSite Instagram Scraper Test Suite")
-    print("Choose test option:")
-    print("1. Run automated tests with sample profiles")
-    print("2. Test with specific username")
-    print("3. Run both tests")
-    
-    choice = input("\nEnter choice (1-3): ").strip()
-    
-    if choice == "1":
-        success = test_profile_extraction()
-    elif choice == "2":
-        success = test_single_profile()
-    elif choice == "3":
-        success1 = test_profile_extraction()
-        success2 = test_single_profile()
-        success = success1 and success2
+        if time.time() - path.stat().st_mtime > _CACHE_MAX_AGE:
+            return None
+        return orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+@pytest.fixture(scope="session")
+def profile_analyses(scraper):
+    """Profile analyses for all test accounts, fetched at most once a day.
+
+    Cache misses are fetched together through the batch helper, which
+    overlaps the network waits, then written back to .cache/ so the
+    next run (or xdist worker) is zero-network. Failures come back as
+    Exception values, are never cached, and surface in the test that
+    owns the username.
+    """
+    analyses = {
+        username: _load_cached_profile(username) for username in TEST_PROFILES
+    }
+    missing = [username for username, data in analyses.items() if data is None]
+
+    if missing:
+        # Session fixtures are per-xdist-worker: on a cold cache every
+        # worker would refetch all profiles at once. The flock makes
+        # one worker do the fetching; the rest block here, then find
+        # its files on the re-check below.
+        _CACHE_DIR.mkdir(exist_ok=True)
+        with open(_CACHE_DIR / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            for username in missing:
+                analyses[username] = _load_cached_profile(username)
+            missing = [u for u in missing if analyses[u] is None]
+
+            if missing:
+                fetched = asyncio.run(
+                    scraper.get_many_profile_analyses(missing, concurrency=3)
+                )
+                for username, data in zip(missing, fetched):
+                    analyses[username] = data
+                    if data and not isinstance(data, Exception):
+                        (_CACHE_DIR / f"{username}.json").write_bytes(orjson.dumps(data))
+
+    return analyses
+
+
+@pytest.mark.parametrize("username", TEST_PROFILES)
+def test_profile_extraction(username, profile_analyses):
+    """Basic profile data extraction for a known public account"""
+    profile_data = profile_analyses[username]
+
+    if isinstance(profile_data, Exception):
+        raise profile_data
+    assert profile_data, f"no profile data for @{username}"
+
+    log.info("✓ Username: @%s", profile_data['username'])
+    log.info("✓ Full Name: %s", profile_data.get('full_name', 'N/A'))
+    log.info("✓ Followers: %d", profile_data.get('follower_count', 0))
+    log.info("✓ Posts: %d", profile_data.get('post_count', 0))
+    log.info("✓ Bio Length: %d chars", len(profile_data.get('biography', '')))
+
+    assert profile_data["username"] == username
+    assert profile_data.get("follower_count", 0) > 0
+
+    # Check brand colors
+    if profile_data.get('brand_colors'):
+        log.info("✓ Brand Colors: %d extracted", len(profile_data['brand_colors']))
+        for i, color in enumerate(profile_data['brand_colors'][:3], 1):
+            log.info("  Color %d: RGB(%d, %d, %d)", i, color['r'], color['g'], color['b'])
     else:
-        print("Invalid choice. Exiting.")
-        sys.exit(1)
-    
-    if success:
-        print("\n✓ Testing completed successfully!")
-        sys.exit(0)
+        log.info("⚠ No brand colors extracted")
+
+    # Check business info
+    business_info = profile_data.get('business_info', {})
+    if business_info:
+        log.info("✓ Business Type: %s", business_info.get('business_type', 'Unknown'))
+
+        if business_info.get('tone'):
+            log.info("✓ Brand Tone: %s", ', '.join(business_info['tone']))
+
+        if business_info.get('keywords'):
+            log.info("✓ Keywords: %d found", len(business_info['keywords']))
+            log.info("  Top 5: %s", ', '.join(business_info['keywords'][:5]))
+    assert business_info, f"no business info for @{username}"
+
+    # Check posts
+    posts = profile_data.get('posts', [])
+    if posts:
+        log.info("✓ Recent Posts: %d retrieved", len(posts))
+        log.info("  Average likes: %d", profile_data.get('avg_likes', 0))
     else:
-        print("\n⚠ Testing completed with some failures.")
-        sys.exit(1)
+        log.info("⚠ No posts retrieved")
+
+
+@pytest.mark.skipif(
+    not os.getenv("SCRAPER_TEST_USERNAME"),
+    reason="set SCRAPER_TEST_USERNAME to test a specific profile",
+)
+def test_single_profile(scraper):
+    """Test with a specific profile chosen via SCRAPER_TEST_USERNAME"""
+    username = os.environ["SCRAPER_TEST_USERNAME"].strip().lstrip("@")
+
+    profile_data = scraper.get_full_profile_analysis(username)
+
+    assert profile_data, f"failed to fetch profile data for @{username}"
 
+    # Save full data - the posts list can be large, and orjson
+    # writes UTF-8 natively (no ensure_ascii detour)
+    filename = f"{username}_test.json"
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(profile_data, option=orjson.OPT_INDENT_2))
+    log.info("✓ Profile data successfully extracted!")
+    log.info("✓ Data saved to %s", filename)
 
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Quick stats
+    log.info("Quick Stats:")
+    log.info("- Followers: %d", profile_data.get('follower_count', 0))
+    log.info("- Posts analyzed: %d", len(profile_data.get('posts', [])))
+    log.info("- Brand colors found: %d", len(profile_data.get('brand_colors', [])))
+    log.info("- Business type: %s", profile_data.get('business_info', {}).get('business_type', 'Unknown'))